@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sys
+import time
+from chenakin_lab_navBatte import BOARD_SIZE, FLEET_SIZES
+# Нагрузка на battle_server: python battle_load.py --sessions 10000 --port 8765
+# Каждая сессия - свое соединение и игра с ботом, с --pvp - два соединения, которые сервер
+# сводит в пару через join. Сначала все сессии подключаются и расставляют флот, потом
+# одновременно стреляют. Замеряется задержка от выстрела до ответа result и от промаха до
+# передачи хода: с ботом - до возвращения turn или end (вместе с ходом бота), в --pvp - до turn у соперника
+def send(writer, message):
+    writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+async def receive(reader, *ops):
+    while True:
+        line = await reader.readline()
+        if not line: raise ConnectionError("сервер закрыл соединение")
+        message = json.loads(line)
+        if message["op"] == "error": raise RuntimeError(message["message"])
+        if message["op"] in ops: return message
+async def prepare(host, port, limit, pvp=False):
+    # (reader, writer, game, start); start в --pvp придет, только когда готов и соперник,
+    # поэтому его ждут уже без limit
+    async with limit:
+        reader, writer = await asyncio.open_connection(host, port)
+        send(writer, {"op": "join" if pvp else "new"})
+        game = await receive(reader, "game")
+    send(writer, {"op": "random"})
+    await receive(reader, "placed")
+    send(writer, {"op": "ready"})
+    return reader, writer, game, await receive(reader, "start")
+async def play(reader, writer, rng, moves, shots, turns):
+    cells = [(x, y) for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)]
+    rng.shuffle(cells)
+    shot = set()
+    sunk = 0
+    try:
+        for x, y in cells:
+            if moves <= 0 or sunk == len(FLEET_SIZES): break
+            if (x, y) in shot: continue  # ореол потопленного корабля сервер уже открыл
+            moves -= 1
+            began = time.perf_counter()
+            send(writer, {"op": "shoot", "x": x, "y": y})
+            result = await receive(reader, "result")
+            shots.append(time.perf_counter() - began)
+            if result["result"] == "sunk":
+                sunk += 1
+                for cx, cy in result["cells"]:
+                    shot.update((cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+            elif result["result"] == "miss":
+                message = await receive(reader, "turn", "end")
+                turns.append(time.perf_counter() - began)
+                if message["op"] == "end": break
+    finally:
+        writer.close()
+async def duel(reader, writer, game, start, clocks, rng, moves, shots, turns):
+    # Одна сторона партии игрок против игрока. clocks[id игры] - когда в ней был последний выстрел:
+    # ход переходит после промаха, так что turn у соперника отсчитывается от этого выстрела
+    cells = [(x, y) for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)]
+    rng.shuffle(cells)
+    cells.reverse()
+    shot = set()
+    sunk = 0
+    turn = start["turn"] == game["side"]
+    try:
+        while True:
+            if not turn:
+                message = await receive(reader, "turn", "end")
+                if message["op"] == "end": break
+                turns.append(time.perf_counter() - clocks[game["id"]])
+                turn = True
+            if moves <= 0: break  # закрытое соединение закончит партию и у соперника
+            x, y = cells.pop()
+            if (x, y) in shot: continue
+            moves -= 1
+            began = clocks[game["id"]] = time.perf_counter()
+            send(writer, {"op": "shoot", "x": x, "y": y})
+            result = await receive(reader, "result")
+            shots.append(time.perf_counter() - began)
+            if result["result"] == "sunk":
+                sunk += 1
+                for cx, cy in result["cells"]:
+                    shot.update((cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+                if sunk == len(FLEET_SIZES):
+                    await receive(reader, "end")
+                    break
+            elif result["result"] == "miss":
+                turn = False
+    finally:
+        writer.close()
+def percentile(values, q):
+    return round(values[min(len(values) - 1, int(len(values) * q))] * 1000, 3) if values else None
+async def run(host, port, sessions, moves, seed, connect, pvp=False):
+    limit = asyncio.Semaphore(connect)  # одновременных подключений, чтобы не переполнить очередь accept
+    connections = sessions * 2 if pvp else sessions
+    prepared = await asyncio.gather(*(prepare(host, port, limit, pvp) for _ in range(connections)),
+                                    return_exceptions=True)
+    failed = [e for e in prepared if isinstance(e, BaseException)]
+    ready = [p for p in prepared if not isinstance(p, BaseException)]
+    print(f"подключено {len(ready)} соединений, ошибок {len(failed)}", file=sys.stderr)
+    shots, turns = [], []
+    began = time.perf_counter()
+    if pvp:
+        clocks = {}
+        games = (duel(reader, writer, game, start, clocks, random.Random(seed * 1000003 + i), moves, shots, turns)
+                 for i, (reader, writer, game, start) in enumerate(ready))
+    else:
+        games = (play(reader, writer, random.Random(seed * 1000003 + i), moves, shots, turns)
+                 for i, (reader, writer, _, _) in enumerate(ready))
+    played = await asyncio.gather(*games, return_exceptions=True)
+    seconds = time.perf_counter() - began
+    failed.extend(e for e in played if isinstance(e, BaseException))
+    return shots, turns, seconds, failed
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный клиент для battle_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=10000, help="число партий")
+    parser.add_argument("--pvp", action="store_true", help="игрок против игрока: два соединения на партию")
+    parser.add_argument("--moves", type=int, default=100, help="выстрелов на игрока, не больше")
+    parser.add_argument("--connect", type=int, default=500, help="одновременных подключений")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    files = args.sessions * (2 if args.pvp else 1) + 100
+    if soft < files <= hard: resource.setrlimit(resource.RLIMIT_NOFILE, (files, hard))
+    shots, turns, seconds, failed = asyncio.run(run(args.host, args.port, args.sessions, args.moves,
+                                                    args.seed, args.connect, args.pvp))
+    shots.sort()
+    turns.sort()
+    report = {"sessions": args.sessions, "pvp": args.pvp, "failed": len(failed), "moves": len(shots), "seconds": round(seconds, 3),
+              "moves_per_sec": round(len(shots) / seconds, 1) if seconds else None,
+              "result_p50_ms": percentile(shots, 0.5), "result_p99_ms": percentile(shots, 0.99),
+              "turn_p50_ms": percentile(turns, 0.5), "turn_p99_ms": percentile(turns, 0.99)}
+    if failed: print("первая ошибка:", repr(failed[0]), file=sys.stderr)
+    print(json.dumps(report, ensure_ascii=False))
+    return 1 if failed else 0
+if __name__ == "__main__":
+    sys.exit(main())
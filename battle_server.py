@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from bitboard import BitBoard
+from chenakin_lab_navBatte import BOARD_SIZE, FLEET_SIZES, Board
+from targeting import DensityTargeting, random_target
+# Сервер морского боя: python battle_server.py --port 8765
+# Протокол - строки JSON, по одной на сообщение. Клиент шлет:
+#   {"op": "new"} - игра с ботом, {"op": "join"} - с другим игроком (ждет пару),
+#   {"op": "place", "x", "y", "size", "horizontal"}, {"op": "random"}, {"op": "ready"},
+#   {"op": "shoot", "x", "y"}
+# Сервер отвечает: game, placed, start, result (свой выстрел), incoming (выстрел соперника),
+#   turn (ваш ход), end, error. Ход бота считается в пуле процессов, а не в цикле событий
+BOARDS = {"list": Board, "bit": BitBoard}
+STRATEGIES = {"random": lambda: random_target, "density": DensityTargeting}
+def send(writer, message):
+    writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+def bot_shots(board, strategy, seed):
+    # ход бота целиком: стреляет, пока попадает; поле - копия, настоящее меняет сервер
+    board = copy.deepcopy(board)
+    rng = random.Random(seed)
+    target = STRATEGIES[strategy]()
+    shots = []
+    while not board.all_ships_sunk():
+        x, y = target(board, rng)
+        result, _ = board.shoot(x, y)
+        shots.append((x, y))
+        if result == "miss": break
+    return shots
+class Session:
+    # Вся игра: два поля, соединения игроков, кто готов и чей ход; бот всегда сторона 1
+    def __init__(self, number, board_class, bot):
+        self.number = number
+        self.boards = [board_class(), board_class()]
+        self.players = [None, None]
+        self.to_place = [Counter(FLEET_SIZES), Counter(FLEET_SIZES)]
+        self.ready = [False, False]
+        self.phase = "prep"
+        self.turn = 0
+        self.bots = [False, bot]
+        if bot:
+            self.boards[1].randomize_fleet()
+            self.to_place[1].clear()
+            self.ready[1] = True
+    def bot(self, side):
+        return self.bots[side]
+    def notify(self, side, message):
+        if self.players[side] is not None: send(self.players[side], message)
+class Server:
+    def __init__(self, board_class=BitBoard, strategy="random", executor=None):
+        self.board_class = board_class
+        self.strategy = strategy
+        self.executor = executor
+        self.sessions = {}
+        self.waiting = None  # игра "один на один", в которой пока один игрок
+        self.numbers = itertools.count(1)
+        self.seeds = random.Random()
+    async def handle(self, reader, writer):
+        session = side = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):  # строка длиннее лимита потока
+                    send(writer, {"op": "error", "message": "слишком длинное сообщение"})
+                    break
+                if not line: break
+                try:
+                    message = json.loads(line)
+                    op = message["op"]
+                except (ValueError, KeyError, TypeError):
+                    send(writer, {"op": "error", "message": "не JSON-сообщение"})
+                    continue
+                if op in ("new", "join"):
+                    if session is not None:
+                        send(writer, {"op": "error", "message": "игра уже идет"})
+                        continue
+                    session, side = self.open(op, writer)
+                elif session is None:
+                    send(writer, {"op": "error", "message": "сначала new или join"})
+                else:
+                    try:
+                        await self.dispatch(session, side, op, message)
+                    except (KeyError, TypeError, ValueError) as e:
+                        send(writer, {"op": "error", "message": f"плохое сообщение {op}: {e}"})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None: self.close(session, side)
+            writer.close()
+    def open(self, op, writer):
+        if op == "join" and self.waiting is not None:
+            session, self.waiting = self.waiting, None
+            side = 1
+        else:
+            session = Session(next(self.numbers), self.board_class, bot=op == "new")
+            self.sessions[session.number] = session
+            side = 0
+            if op == "join": self.waiting = session
+        session.players[side] = writer
+        send(writer, {"op": "game", "id": session.number, "side": side, "size": BOARD_SIZE})
+        if op == "join" and side == 1: session.notify(0, {"op": "opponent"})
+        return session, side
+    def close(self, session, side):
+        session.players[side] = None
+        if self.waiting is session: self.waiting = None
+        if session.phase != "end" and not session.bot(1 - side):
+            session.notify(1 - side, {"op": "end", "winner": 1 - side, "reason": "соперник отключился"})
+        session.phase = "end"
+        self.sessions.pop(session.number, None)
+    async def dispatch(self, session, side, op, message):
+        board = session.boards[side]
+        if op == "place":
+            size, x, y = int(message["size"]), int(message["x"]), int(message["y"])
+            horizontal = bool(message["horizontal"])
+            ok = (session.phase == "prep" and not session.ready[side] and session.to_place[side][size] > 0
+                  and board.place_ship(x, y, size, horizontal))
+            if ok: session.to_place[side][size] -= 1
+            session.notify(side, {"op": "placed", "ok": ok})
+        elif op == "random":
+            ok = session.phase == "prep" and not session.ready[side]
+            if ok:
+                board.randomize_fleet()
+                session.to_place[side].clear()
+            session.notify(side, {"op": "placed", "ok": ok})
+        elif op == "ready":
+            if session.phase != "prep" or +session.to_place[side]:
+                session.notify(side, {"op": "error", "message": "расставлены не все корабли"})
+                return
+            session.ready[side] = True
+            if all(session.ready):
+                session.phase = "battle"
+                for player in (0, 1):
+                    session.notify(player, {"op": "start", "turn": session.turn})
+        elif op == "shoot":
+            x, y = int(message["x"]), int(message["y"])
+            if session.phase != "battle" or session.turn != side:
+                session.notify(side, {"op": "error", "message": "не ваш ход"})
+                return
+            if not (0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE):
+                session.notify(side, {"op": "error", "message": "мимо поля"})
+                return
+            result = self.fire(session, side, x, y)
+            if result == "miss" and session.phase == "battle":
+                if session.bot(session.turn): await self.bot_turn(session)
+                else: session.notify(session.turn, {"op": "turn"})
+        else:
+            session.notify(side, {"op": "error", "message": "неизвестная команда " + op})
+    def fire(self, session, side, x, y):
+        # выстрел стороны side по полю соперника с рассылкой результата обоим
+        board = session.boards[1 - side]
+        result, ship = board.shoot(x, y)
+        if result == "repeat":
+            session.notify(side, {"op": "error", "message": "сюда уже стреляли"})
+            return result
+        cells = sorted(ship) if result == "sunk" else None
+        session.notify(side, {"op": "result", "x": x, "y": y, "result": result, "cells": cells})
+        session.notify(1 - side, {"op": "incoming", "x": x, "y": y, "result": result, "cells": cells})
+        if board.all_ships_sunk():
+            session.phase = "end"
+            for player in (0, 1):
+                session.notify(player, {"op": "end", "winner": side})
+        elif result == "miss":
+            session.turn = 1 - side
+        return result
+    async def bot_turn(self, session):
+        loop = asyncio.get_running_loop()
+        shots = await loop.run_in_executor(self.executor, bot_shots, session.boards[0], self.strategy,
+                                           self.seeds.getrandbits(32))
+        # handle() ждет этот вызов через dispatch, так что close() сессии здесь еще не было
+        for x, y in shots:
+            self.fire(session, 1, x, y)
+        if session.phase == "battle": session.notify(0, {"op": "turn"})
+async def serve(host, port, server):
+    listener = await asyncio.start_server(server.handle, host, port, backlog=4096)
+    print(f"сервер на {host}:{port}", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервер морского боя")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--board", choices=sorted(BOARDS), default="bit",
+                        help="поле; ход бота на bit в 2-4 раза быстрее, чем на list (board_bench.py server)")
+    parser.add_argument("--bot", choices=sorted(STRATEGIES), default="density")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="процессов для ходов бота; 0 - потоки в этом же процессе")
+    args = parser.parse_args(argv)
+    executor = ThreadPoolExecutor() if args.workers == 0 else ProcessPoolExecutor(max_workers=args.workers)
+    with executor:
+        try:
+            asyncio.run(serve(args.host, args.port, Server(BOARDS[args.board], args.bot, executor)))
+        except KeyboardInterrupt:
+            pass
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
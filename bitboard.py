@@ -0,0 +1,149 @@
+from chenakin_lab_navBatte import BOARD_SIZE, FLEET_SIZES, get_neighbors
+# Поле морского боя на битовых масках: бит y*BOARD_SIZE + x отвечает за клетку (x, y).
+# Корабли, попадания, промахи и потопленные клетки - по одному целому числу,
+# ореол клетки (она сама и 8 соседей) посчитан заранее
+CELLS = BOARD_SIZE * BOARD_SIZE
+def _halo(k):
+    x, y = k % BOARD_SIZE, k // BOARD_SIZE
+    mask = 1 << k
+    for nx, ny in get_neighbors(x, y):
+        mask |= 1 << (ny * BOARD_SIZE + nx)
+    return mask
+HALO = [_halo(k) for k in range(CELLS)]
+def ship_masks(x, y, length, horizontal):
+    # (маска корабля, маска корабля с ореолом) или None, если корабль не влезает
+    if horizontal and not (0 <= x and x + length <= BOARD_SIZE and 0 <= y < BOARD_SIZE): return None
+    if not horizontal and not (0 <= x < BOARD_SIZE and 0 <= y and y + length <= BOARD_SIZE): return None
+    step = 1 if horizontal else BOARD_SIZE
+    k = y * BOARD_SIZE + x
+    ship = halo = 0
+    for i in range(length):
+        ship |= 1 << (k + i * step)
+        halo |= HALO[k + i * step]
+    return ship, halo
+def _placements(length, horizontal):
+    result = []
+    for y in range(BOARD_SIZE):
+        for x in range(BOARD_SIZE):
+            masks = ship_masks(x, y, length, horizontal)
+            if masks is not None: result.append((x, y) + masks)
+    return result
+# (длина, горизонтально) -> [(x, y, маска корабля, маска с ореолом)]
+PLACEMENTS = {(length, horizontal): _placements(length, horizontal)
+              for length in set(FLEET_SIZES) | {1, 2, 3, 4} for horizontal in (True, False)}
+_MASKS = {(x, y, length, horizontal): (ship, halo)
+          for (length, horizontal), items in PLACEMENTS.items() for x, y, ship, halo in items}
+def masks_of(x, y, length, horizontal):
+    masks = _MASKS.get((x, y, length, horizontal))
+    return masks if masks is not None else ship_masks(x, y, length, horizontal)
+def cells_of(mask):
+    cells = set()
+    while mask:
+        low = mask & -mask
+        k = low.bit_length() - 1
+        cells.add((k % BOARD_SIZE, k // BOARD_SIZE))
+        mask ^= low
+    return cells
+class _Row:
+    def __init__(self, board, y):
+        self.board, self.y = board, y
+    def __getitem__(self, x):
+        return self.board.cell_value(x, self.y)
+    def __len__(self):
+        return self.board.size
+    def __iter__(self):
+        return (self.board.cell_value(x, self.y) for x in range(self.board.size))
+class _Grid:
+    # Вид grid[y][x] с теми же значениями, что у Board: 0, 1, -1, 2, 3. Общий для полей
+    # без списка списков (BitBoard, SparseBoard, BoardState): им нужны size и cell_value(x, y)
+    def __init__(self, board):
+        self.board = board
+    def __getitem__(self, y):
+        return _Row(self.board, y)
+    def __len__(self):
+        return self.board.size
+    def __iter__(self):
+        return (_Row(self.board, y) for y in range(self.board.size))
+class BitBoard:
+    # Замена Board для GameApp: тот же интерфейс, но проверки - несколько битовых операций
+    size = BOARD_SIZE
+    def __init__(self):
+        self.clear()
+    def clear(self):
+        self.occupied = self.hits = self.misses = self.sunk = 0
+        self.ships = []  # маски кораблей
+        self.halos = []  # маски кораблей с ореолом
+        self.cells = []  # клетки кораблей, их возвращает shoot
+        self.owner = {}  # номер клетки -> индекс корабля
+        self.grid = _Grid(self)
+    def cell_value(self, x, y):
+        bit = 1 << (y * BOARD_SIZE + x)
+        if self.sunk & bit: return 3
+        if self.hits & bit: return 2
+        if self.misses & bit: return -1
+        return 1 if self.occupied & bit else 0
+    def can_place_ship(self, x, y, length, horizontal):
+        masks = masks_of(x, y, length, horizontal)
+        if masks is None: return False
+        ship, halo = masks
+        # как у Board: сами клетки пустые и нетронутые, рядом нет целых палуб (подбитые не мешают)
+        return (not (ship & (self.occupied | self.hits | self.misses | self.sunk))
+                and not (halo & self.occupied & ~(self.hits | self.sunk)))
+    def place_ship(self, x, y, length, horizontal):
+        if not self.can_place_ship(x, y, length, horizontal): return False
+        self.add_ship(*masks_of(x, y, length, horizontal))
+        return True
+    def add_ship(self, ship, halo):
+        index = len(self.ships)
+        self.ships.append(ship)
+        self.halos.append(halo)
+        self.cells.append(cells_of(ship))
+        self.occupied |= ship
+        mask = ship
+        while mask:
+            low = mask & -mask
+            self.owner[low.bit_length() - 1] = index
+            mask ^= low
+    def remove_ship_at(self, x, y):
+        index = self.owner.get(y * BOARD_SIZE + x)
+        if index is None: return 0
+        removed = self.ships[index]
+        length = bin(removed).count("1")
+        self.hits &= ~removed
+        self.sunk &= ~removed
+        kept = [(ship, halo) for i, (ship, halo) in enumerate(zip(self.ships, self.halos)) if i != index]
+        self.occupied, self.ships, self.halos, self.cells, self.owner = 0, [], [], [], {}
+        for ship, halo in kept:
+            self.add_ship(ship, halo)
+        return length
+    def randomize_fleet(self):
+        from fleet import random_fleet
+        self.clear()
+        for _, _, ship, halo, _, _ in random_fleet():
+            self.add_ship(ship, halo)
+        return True
+    def shoot(self, x, y):
+        k = y * BOARD_SIZE + x
+        bit = 1 << k
+        if bit & (self.hits | self.misses | self.sunk): return "repeat", None
+        if not bit & self.occupied:
+            self.misses |= bit
+            return "miss", None
+        self.hits |= bit
+        index = self.owner[k]
+        ship = self.ships[index]
+        if ship & ~self.hits: return "hit", self.cells[index]
+        self.hits &= ~ship
+        self.sunk |= ship
+        self.misses |= self.halos[index] & ~self.occupied
+        return "sunk", self.cells[index]
+    def all_ships_sunk(self):
+        return not (self.occupied & ~self.sunk)
+    def __deepcopy__(self, memo):
+        # ход бота в battle_server копирует поле: маски - числа, списки достаточно скопировать поверху
+        board = object.__new__(type(self))
+        board.occupied, board.hits, board.misses, board.sunk = self.occupied, self.hits, self.misses, self.sunk
+        board.ships, board.halos, board.cells = list(self.ships), list(self.halos), list(self.cells)
+        board.owner = dict(self.owner)
+        board.grid = _Grid(board)
+        return board
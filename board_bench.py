@@ -0,0 +1,65 @@
+import argparse
+import json
+import pickle
+import random
+import sys
+import time
+from battle_server import bot_shots
+from selfplay import BOARDS, STRATEGIES, finish, random_board
+# Замеры полей морского боя на одних и тех же партиях:
+# python board_bench.py --games 2000 --boards list bit sparse --out boards.json
+# raw - расстановка и выстрелы по всем клеткам подряд, random/density - партии selfplay
+# с этой стратегией, server - ход бота как в battle_server: поле уходит в процесс пула через
+# pickle, там копируется, выстрелы возвращаются и применяются к настоящему полю
+def raw(board_class, rng):
+    board = random_board(rng, board_class)
+    cells = [(x, y) for y in range(10) for x in range(10)]
+    rng.shuffle(cells)
+    for x, y in cells:
+        board.shoot(x, y)
+        if board.all_ships_sunk(): break
+def server(board_class, rng):
+    board = random_board(rng, board_class)
+    while not board.all_ships_sunk():
+        for x, y in bot_shots(pickle.loads(pickle.dumps(board)), "random", rng.getrandbits(32)):
+            board.shoot(x, y)
+WORKLOADS = {
+    "raw": raw,
+    "random": lambda board_class, rng: finish(STRATEGIES["random"](), random_board(rng, board_class), rng),
+    "density": lambda board_class, rng: finish(STRATEGIES["density"](), random_board(rng, board_class), rng),
+    "server": server,
+}
+def measure(workload, board_class, games, seed):
+    rng = random.Random(seed)
+    began = time.perf_counter()
+    for _ in range(games):
+        workload(board_class, rng)
+    return time.perf_counter() - began
+def run(boards, workloads, games, seed=1):
+    results = []
+    for name in workloads:
+        base = None
+        for board in boards:
+            seconds = measure(WORKLOADS[name], BOARDS[board], games, seed)
+            if base is None: base = seconds
+            results.append({"workload": name, "board": board, "games": games, "seconds": round(seconds, 4),
+                            "games_per_sec": round(games / seconds, 1), "speedup": round(base / seconds, 2)})
+            print(f"{name:<8} {board:<7} {seconds:8.3f} с {games / seconds:10.1f} партий/с "
+                  f"x{base / seconds:5.2f} к {boards[0]}", file=sys.stderr)
+    return results
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры полей морского боя")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--boards", nargs="+", choices=sorted(BOARDS), default=["list", "bit", "sparse"],
+                        help="первое поле - база для ускорения")
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="файл для итогов в JSON")
+    args = parser.parse_args(argv)
+    results = run(args.boards, args.workloads, args.games, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"seed": args.seed, "results": results}, f, indent=1)
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+from bitboard import HALO, _Grid, cells_of, masks_of
+from chenakin_lab_navBatte import BOARD_SIZE
+from gamelog import fleet_of
+# Неизменяемое состояние поля для перебора вариантов ботом: выстрел не меняет состояние,
+# а возвращает новое - четыре числа-маски и ссылку на предыдущее (для undo). Расстановка
+# кораблей (маски, ореолы, владелец клетки) одна на все состояния партии и не копируется
+class Layout:
+    # masks - [(маска корабля, маска с ореолом)], как у BitBoard и в fleet.random_fleet
+    def __init__(self, masks):
+        self.ships = []
+        self.halos = []
+        self.owner = {}  # номер клетки -> индекс корабля
+        self.occupied = 0
+        for ship, halo in masks:
+            if halo & self.occupied: raise ValueError("корабли касаются")
+            mask = ship
+            while mask:
+                low = mask & -mask
+                self.owner[low.bit_length() - 1] = len(self.ships)
+                mask ^= low
+            self.ships.append(ship)
+            self.halos.append(halo)
+            self.occupied |= ship
+    @classmethod
+    def from_fleet(cls, fleet):
+        # fleet - [(x, y, длина, горизонтально)]
+        masks = [masks_of(x, y, length, horizontal) for x, y, length, horizontal in fleet]
+        if None in masks: raise ValueError("корабль не помещается на поле")
+        return cls(masks)
+class BoardState:
+    # layout может быть None: тогда флот неизвестен, и исходы выстрелов задает mark()
+    size = BOARD_SIZE
+    def __init__(self, layout=None, hits=0, misses=0, sunk=0, parent=None):
+        self.layout = layout
+        self.hits, self.misses, self.sunk = hits, misses, sunk
+        self.parent = parent
+    @property
+    def grid(self):
+        return _Grid(self)
+    @classmethod
+    def from_board(cls, board, known=True):
+        # снимок Board, BitBoard или SparseBoard 10x10; known=False - только то, что видит соперник
+        hits = misses = sunk = 0
+        for y in range(BOARD_SIZE):
+            for x in range(BOARD_SIZE):
+                value, bit = board.grid[y][x], 1 << (y * BOARD_SIZE + x)
+                if value == -1: misses |= bit
+                elif value == 2: hits |= bit
+                elif value == 3: sunk |= bit
+        return cls(Layout.from_fleet(fleet_of(board)) if known else None, hits, misses, sunk)
+    def cell_value(self, x, y):
+        bit = 1 << (y * BOARD_SIZE + x)
+        if self.sunk & bit: return 3
+        if self.hits & bit: return 2
+        if self.misses & bit: return -1
+        return 1 if self.layout is not None and self.layout.occupied & bit else 0
+    def shoot(self, x, y):
+        # (результат, клетки корабля или None, новое состояние) - как Board.shoot, но без изменений
+        k = y * BOARD_SIZE + x
+        bit = 1 << k
+        if bit & (self.hits | self.misses | self.sunk): return "repeat", None, self
+        layout = self.layout
+        if layout is None: raise ValueError("флот неизвестен: исход выстрела задается через mark()")
+        if not bit & layout.occupied:
+            return "miss", None, BoardState(layout, self.hits, self.misses | bit, self.sunk, self)
+        index = layout.owner[k]
+        ship = layout.ships[index]
+        hits = self.hits | bit
+        if ship & ~hits: return "hit", cells_of(ship), BoardState(layout, hits, self.misses, self.sunk, self)
+        return "sunk", cells_of(ship), BoardState(layout, hits & ~ship, self.misses | layout.halos[index] & ~ship,
+                                                  self.sunk | ship, self)
+    def mark(self, x, y, result, cells=None):
+        # предполагаемый исход выстрела при неизвестном флоте; для "sunk" cells - клетки корабля
+        bit = 1 << (y * BOARD_SIZE + x)
+        if result == "miss": return BoardState(self.layout, self.hits, self.misses | bit, self.sunk, self)
+        if result == "hit": return BoardState(self.layout, self.hits | bit, self.misses, self.sunk, self)
+        ship = halo = 0
+        for cx, cy in cells:
+            ship |= 1 << (cy * BOARD_SIZE + cx)
+            halo |= HALO[cy * BOARD_SIZE + cx]
+        return BoardState(self.layout, (self.hits | bit) & ~ship, self.misses | halo & ~ship, self.sunk | ship, self)
+    def undo(self):
+        return self.parent
+    def all_ships_sunk(self):
+        return self.layout is not None and not self.layout.occupied & ~self.sunk
@@ -1,7 +1,7 @@
 import tkinter as tk
-import random
 BOARD_SIZE = 10
 FLEET_SIZES = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
+FRAME_MS = 16  # не чаще одного обновления рамки перетаскивания за кадр
 def get_neighbors(x, y):
     neighbors = []
     for dx in (-1, 0, 1):
@@ -12,8 +12,13 @@ def get_neighbors(x, y):
     return neighbors
 class Board:
     def __init__(self):
+        self.clear()
+    def clear(self):
         self.grid = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
         self.ships = []
+        self.ship_at = [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        self.hits_left = []
+        self.ships_left = 0
     def can_place_ship(self, x, y, length, horizontal):
         cells = []
         for i in range(length):
@@ -33,27 +38,29 @@ class Board:
             cell_x = x + i if horizontal else x
             cell_y = y if horizontal else y + i
             self.grid[cell_y][cell_x] = 1
+            self.ship_at[cell_y][cell_x] = len(self.ships)
             ship_cells.append((cell_x, cell_y))
         self.ships.append(set(ship_cells))
+        self.hits_left.append(length)
+        self.ships_left += 1
         return True
     def remove_ship_at(self, x, y):
-        for ship in list(self.ships):
-            if (x, y) in ship:
-                for cell_x, cell_y in ship:
-                    self.grid[cell_y][cell_x] = 0
-                self.ships.remove(ship)
-                return len(ship)
-        return 0
+        index = self.ship_at[y][x]
+        if index is None: return 0
+        ship = self.ships.pop(index)
+        if self.hits_left.pop(index): self.ships_left -= 1
+        for cell_x, cell_y in ship:
+            self.grid[cell_y][cell_x] = 0
+            self.ship_at[cell_y][cell_x] = None
+        for i in range(index, len(self.ships)):
+            for cell_x, cell_y in self.ships[i]:
+                self.ship_at[cell_y][cell_x] = i
+        return len(ship)
     def randomize_fleet(self):
-        self.__init__()
-        for ship_size in FLEET_SIZES:
-            for _ in range(3000):
-                horizontal = random.choice([True, False])
-                max_x = BOARD_SIZE - ship_size if horizontal else BOARD_SIZE - 1
-                max_y = BOARD_SIZE - 1 if horizontal else BOARD_SIZE - ship_size
-                x = random.randint(0, max_x)
-                y = random.randint(0, max_y)
-                if self.place_ship(x, y, ship_size, horizontal): break
+        from fleet import random_fleet
+        self.clear()
+        for x, y, _, _, ship_size, horizontal in random_fleet():
+            self.place_ship(x, y, ship_size, horizontal)
         return True
     def shoot(self, x, y):
         cell_value = self.grid[y][x]
@@ -62,35 +69,39 @@ class Board:
             self.grid[y][x] = -1
             return "miss", None
         self.grid[y][x] = 2
-        for ship in self.ships:
-            if (x, y) in ship:
-                if all(self.grid[cy][cx] == 2 for cx, cy in ship):
-                    for cx, cy in ship:
-                        self.grid[cy][cx] = 3
-                    for cx, cy in ship:
-                        for nx, ny in get_neighbors(cx, cy):
-                            if self.grid[ny][nx] == 0:
-                                self.grid[ny][nx] = -1
-                    return "sunk", ship
-                return "hit", ship
-        return "miss", None
+        index = self.ship_at[y][x]
+        ship = self.ships[index]
+        self.hits_left[index] -= 1
+        if self.hits_left[index]: return "hit", ship
+        self.ships_left -= 1
+        for cx, cy in ship:
+            self.grid[cy][cx] = 3
+        for cx, cy in ship:
+            for nx, ny in get_neighbors(cx, cy):
+                if self.grid[ny][nx] == 0:
+                    self.grid[ny][nx] = -1
+        return "sunk", ship
     def all_ships_sunk(self):
-        for ship in self.ships:
-            for x, y in ship:
-                if self.grid[y][x] != 3: return False
-        return True
+        return self.ships_left == 0
 class GameApp:
-    def __init__(self, root):
+    def __init__(self, root, board_class=None, ai_strategy=None):
         self.root = root
         self.root.title("Морской бой")
         self.root.geometry("1200x720")
-        self.player_board = Board()
-        self.enemy_board = Board()
+        self.board_class = board_class or Board
+        if ai_strategy is None:
+            from targeting import DensityTargeting
+            ai_strategy = DensityTargeting()
+        self.ai_strategy = ai_strategy
+        self.player_board = self.board_class()
+        self.enemy_board = self.board_class()
         self.game_phase = "prep"
         self.dragging_ship = None
         self.ship_horizontal = True
         self.ships_to_place = {1: 4, 2: 3, 3: 2, 4: 1}
         self.last_mouse_pos = (0, 0)
+        self.motion_job = None
+        self.legal_cache = {}  # (клетка, длина, горизонтально) -> можно ли поставить; сбрасывается в draw()
         self.canvas = tk.Canvas(self.root, width=1200, height=720, bg="black")
         self.canvas.pack()
         self.padding = 32
@@ -104,6 +115,7 @@ class GameApp:
                                                                                                          anchor="n")
         self.create_toolbar()
         self.bind_events()
+        self.create_scene()
         self.draw()
     def create_toolbar(self):
         toolbar = tk.Frame(self.root, bg="black")
@@ -123,30 +135,37 @@ class GameApp:
         self.root.bind("<Key-r>", self.rotate_ship)
         self.root.bind("<Key-n>", lambda e: self.new_game())
     def new_game(self):
-        self.player_board = Board()
-        self.enemy_board = Board()
+        self.player_board = self.board_class()
+        self.enemy_board = self.board_class()
         self.game_phase = "prep"
         self.dragging_ship = None
         self.ship_horizontal = True
         self.ships_to_place = {1: 4, 2: 3, 3: 2, 4: 1}
         self.message.set("Новая игра. Расставьте корабли или нажмите «Случайно».")
         self.draw()
-    def draw(self):
-        self.canvas.delete("all")
-        self.draw_background()
-        self.draw_boards()
-        if self.game_phase == "prep":
-            self.draw_ship_panel()
-            self.draw_drag_preview()
-    def draw_background(self):
+    def create_scene(self):
+        # Фон, сетки, док и рамка перетаскивания создаются один раз; дальше меняются
+        # только отметки в клетках, которые хранятся по клеткам вместе с показанным значением
         self.canvas.create_rectangle(0, 0, 1200, 720, fill="black")
         self.canvas.create_rectangle(0, 56, self.panel_pos[0] + 200, 720, fill="#111")
-    def draw_boards(self):
         self.draw_grid(self.player_board_pos[0], self.player_board_pos[1], "ТВОЙ ФЛОТ", "blue", True)
-        self.draw_cells(self.player_board, self.player_board_pos[0], self.player_board_pos[1], True)
-        show_enemy_ships = self.game_phase != "battle"
         self.draw_grid(self.enemy_board_pos[0], self.enemy_board_pos[1], "ФЛОТ БОТА", "red", False)
-        self.draw_cells(self.enemy_board, self.enemy_board_pos[0], self.enemy_board_pos[1], show_enemy_ships)
+        self.draw_ship_panel()
+        self.markers = {side: [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)] for side in ("player", "enemy")}
+        self.shown = {side: [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)] for side in ("player", "enemy")}
+        self.preview = self.canvas.create_rectangle(0, 0, 0, 0, width=2, dash=(4, 2), state="hidden")
+        self.preview_key = None
+    def draw(self):
+        # полная сверка клеток с полями: на холсте меняется только то, что изменилось
+        for side in ("player", "enemy"):
+            self.update_cells(side, [(x, y) for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)])
+        self.canvas.itemconfigure("panel", state="normal" if self.game_phase == "prep" else "hidden")
+        for size, text in self.count_texts.items():
+            self.canvas.itemconfigure(text, text=f"x{self.ships_to_place.get(size, 0)}")
+        self.canvas.itemconfigure(self.preview, state="hidden")  # рамку снова покажет draw_drag_preview, если корабль тащат
+        self.preview_key = None
+        self.legal_cache = {}  # draw() вызывается после каждого изменения поля
+        self.draw_drag_preview()
     def draw_grid(self, x, y, title, color, show_coords):
         self.canvas.create_rectangle(x - 10, y - 10, x + BOARD_SIZE * self.cell_size + 10,
                                      y + BOARD_SIZE * self.cell_size + 10, outline="gray", width=2)
@@ -164,57 +183,81 @@ class GameApp:
                 x2 = x1 + self.cell_size
                 y2 = y1 + self.cell_size
                 self.canvas.create_rectangle(x1, y1, x2, y2, fill="black", outline="gray", width=1)
-    def draw_cells(self, board, x, y, show_ships):
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                cell_value = board.grid[row][col]
-                x1 = x + col * self.cell_size
-                y1 = y + row * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-                if show_ships and cell_value == 1:
-                    self.canvas.create_rectangle(x1 + 3, y1 + 6, x2 - 3, y2 - 6, fill="green", outline="")
-                elif cell_value == -1:
-                    self.canvas.create_oval(x1 + 10, y1 + 10, x2 - 10, y2 - 10, outline="gray", width=2)
-                elif cell_value == 2:
-                    self.canvas.create_oval(x1 + 6, y1 + 6, x2 - 6, y2 - 6, fill="orange", outline="")
-                elif cell_value == 3:
-                    self.canvas.create_rectangle(x1 + 4, y1 + 4, x2 - 4, y2 - 4, fill="red", outline="")
+    def update_cells(self, side, cells):
+        board = self.player_board if side == "player" else self.enemy_board
+        x, y = self.player_board_pos if side == "player" else self.enemy_board_pos
+        show_ships = side == "player" or self.game_phase != "battle"
+        markers, shown = self.markers[side], self.shown[side]
+        for col, row in cells:
+            cell_value = board.grid[row][col]
+            if cell_value == 1 and not show_ships: cell_value = 0
+            if cell_value == shown[row][col]: continue
+            shown[row][col] = cell_value
+            if markers[row][col] is not None: self.canvas.delete(markers[row][col])
+            markers[row][col] = self.draw_marker(x + col * self.cell_size, y + row * self.cell_size, cell_value)
+    def draw_marker(self, x1, y1, cell_value):
+        x2 = x1 + self.cell_size
+        y2 = y1 + self.cell_size
+        if cell_value == 1:
+            return self.canvas.create_rectangle(x1 + 3, y1 + 6, x2 - 3, y2 - 6, fill="green", outline="")
+        elif cell_value == -1:
+            return self.canvas.create_oval(x1 + 10, y1 + 10, x2 - 10, y2 - 10, outline="gray", width=2)
+        elif cell_value == 2:
+            return self.canvas.create_oval(x1 + 6, y1 + 6, x2 - 6, y2 - 6, fill="orange", outline="")
+        elif cell_value == 3:
+            return self.canvas.create_rectangle(x1 + 4, y1 + 4, x2 - 4, y2 - 4, fill="red", outline="")
+        return None
+    def shot_cells(self, x, y, result, ship):
+        # клетки, которые мог изменить выстрел: при потоплении - корабль и его ореол
+        if result != "sunk": return [(x, y)]
+        cells = set(ship)
+        for cx, cy in ship:
+            cells.update(get_neighbors(cx, cy))
+        return cells
     def draw_ship_panel(self):
         x, y = self.panel_pos
         height = BOARD_SIZE * self.cell_size
-        self.canvas.create_rectangle(x - 8, y - 16, x + 196, y + height + 24, fill="#111", outline="gray", width=2)
-        self.canvas.create_text(x + 96, y - 24, fill="cyan", text="Док кораблей")
+        self.canvas.create_rectangle(x - 8, y - 16, x + 196, y + height + 24, fill="#111", outline="gray", width=2,
+                                     tags="panel")
+        self.canvas.create_text(x + 96, y - 24, fill="cyan", text="Док кораблей", tags="panel")
         self.ship_rectangles = []
+        self.count_texts = {}
         current_y = y + 8
         for size in [4, 3, 2, 1]:
-            self.canvas.create_rectangle(x + 12, current_y, x + 184, current_y + 32, outline="gray", width=1)
+            self.canvas.create_rectangle(x + 12, current_y, x + 184, current_y + 32, outline="gray", width=1,
+                                         tags="panel")
             for i in range(size):
                 self.canvas.create_rectangle(x + 16 + i * 26, current_y + 6, x + 16 + i * 26 + 22, current_y + 26,
-                                             fill="green", outline="")
+                                             fill="green", outline="", tags="panel")
             count = self.ships_to_place.get(size, 0)
-            self.canvas.create_text(x + 170, current_y + 16, fill="white", text=f"x{count}")
+            self.count_texts[size] = self.canvas.create_text(x + 170, current_y + 16, fill="white", text=f"x{count}",
+                                                             tags="panel")
             self.ship_rectangles.append((size, (x + 12, current_y, x + 184, current_y + 32)))
             current_y += 38
     def draw_drag_preview(self):
-        if not self.dragging_ship: return
-        mouse_x, mouse_y = self.last_mouse_pos
-        board_x, board_y = self.player_board_pos
-        cell = self.get_cell_from_coords(board_x, board_y, mouse_x, mouse_y)
-        if not cell: return
+        # одна пунктирная рамка на весь корабль; пока клетка и поворот те же, холст не трогаем
+        cell = None
+        if self.dragging_ship and self.game_phase == "prep":
+            board_x, board_y = self.player_board_pos
+            cell = self.get_cell_from_coords(board_x, board_y, *self.last_mouse_pos)
+        key = cell and (cell, self.dragging_ship["size"], self.dragging_ship["horizontal"])
+        if key == self.preview_key: return
+        self.preview_key = key
+        if not key:
+            self.canvas.itemconfigure(self.preview, state="hidden")
+            return
         ship_size = self.dragging_ship["size"]
         horizontal = self.dragging_ship["horizontal"]
-        can_place = self.player_board.can_place_ship(cell[0], cell[1], ship_size, horizontal)
-        for i in range(ship_size):
-            cell_x = cell[0] + i if horizontal else cell[0]
-            cell_y = cell[1] if horizontal else cell[1] + i
-            if 0 <= cell_x < BOARD_SIZE and 0 <= cell_y < BOARD_SIZE:
-                x1 = board_x + cell_x * self.cell_size
-                y1 = board_y + cell_y * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-                color = "lightgreen" if can_place else "red"
-                self.canvas.create_rectangle(x1 + 3, y1 + 3, x2 - 3, y2 - 3, outline=color, width=2, dash=(4, 2))
+        if key not in self.legal_cache:
+            self.legal_cache[key] = self.player_board.can_place_ship(cell[0], cell[1], ship_size, horizontal)
+        can_place = self.legal_cache[key]
+        end_x = min(cell[0] + ship_size if horizontal else cell[0] + 1, BOARD_SIZE)
+        end_y = min(cell[1] + 1 if horizontal else cell[1] + ship_size, BOARD_SIZE)
+        board_x, board_y = self.player_board_pos
+        self.canvas.coords(self.preview, board_x + cell[0] * self.cell_size + 3, board_y + cell[1] * self.cell_size + 3,
+                           board_x + end_x * self.cell_size - 3, board_y + end_y * self.cell_size - 3)
+        self.canvas.itemconfigure(self.preview, outline="lightgreen" if can_place else "red", state="normal")
+        self.canvas.tag_raise(self.preview)
     def get_cell_from_coords(self, board_x, board_y, mouse_x, mouse_y):
         cell_x = (mouse_x - board_x) // self.cell_size
         cell_y = (mouse_y - board_y) // self.cell_size
@@ -232,7 +275,7 @@ class GameApp:
             self.dragging_ship["horizontal"] = not self.dragging_ship["horizontal"]
         else:
             self.ship_horizontal = not self.ship_horizontal
-        self.draw()
+        self.draw_drag_preview()
     def on_mouse_down(self, event):
         self.last_mouse_pos = (event.x, event.y)
         if self.game_phase == "prep":
@@ -258,8 +301,12 @@ class GameApp:
             self.player_shoot(cell[0], cell[1])
     def on_mouse_move(self, event):
         self.last_mouse_pos = (event.x, event.y)
-        if self.game_phase == "prep" and self.dragging_ship:
-            self.draw()
+        if self.game_phase == "prep" and self.dragging_ship and self.motion_job is None:
+            # события движения между кадрами только запоминают позицию
+            self.motion_job = self.root.after(FRAME_MS, self.flush_motion)
+    def flush_motion(self):
+        self.motion_job = None
+        self.draw_drag_preview()
     def on_mouse_up(self, event):
         self.last_mouse_pos = (event.x, event.y)
         if self.game_phase != "prep" or not self.dragging_ship: return
@@ -279,7 +326,7 @@ class GameApp:
         self.draw()
     def clear_player_fleet(self):
         if self.game_phase != "prep": return
-        self.player_board = Board()
+        self.player_board = self.board_class()
         self.ships_to_place = {1: 4, 2: 3, 3: 2, 4: 1}
         self.dragging_ship = None
         self.draw()
@@ -293,12 +340,13 @@ class GameApp:
         self.message.set("Бой начался. Стреляйте по правому полю.")
         self.draw()
     def player_shoot(self, x, y):
-        result, _ = self.enemy_board.shoot(x, y)
+        result, ship = self.enemy_board.shoot(x, y)
         if result == "repeat": return
-        self.draw()
+        self.update_cells("enemy", self.shot_cells(x, y, result, ship))
         if self.enemy_board.all_ships_sunk():
             self.message.set("Вы победили! N - новая игра.")
             self.game_phase = "end"
+            self.draw()
             return
         if result == "miss":
             self.root.after(300, self.ai_turn)
@@ -310,8 +358,8 @@ class GameApp:
             self.draw()
             return
         x, y = self.choose_ai_target()
-        result, _ = self.player_board.shoot(x, y)
-        self.draw()
+        result, ship = self.player_board.shoot(x, y)
+        self.update_cells("player", self.shot_cells(x, y, result, ship))
         if result == "hit":
             self.message.set(f"бот попал в {chr(65 + x)}{y + 1} и продолжает атаку…")
             self.root.after(220, self.ai_turn)
@@ -322,25 +370,7 @@ class GameApp:
             return
         else: self.message.set("бот промахнулся. Ваш ход.")
     def choose_ai_target(self):
-        board = self.player_board.grid
-        hits = []
-        for y in range(BOARD_SIZE):
-            for x in range(BOARD_SIZE):
-                if board[y][x] == 2:
-                    hits.append((x, y))
-        random.shuffle(hits)
-        for hx, hy in hits:
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                nx, ny = hx + dx, hy + dy
-                if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE:
-                    if board[ny][nx] not in (-1, 2, 3):
-                        return nx, ny
-        candidates = []
-        for y in range(BOARD_SIZE):
-            for x in range(BOARD_SIZE):
-                if board[y][x] not in (-1, 2, 3):
-                    candidates.append((x, y))
-        return random.choice(candidates) if candidates else (0, 0)
+        return self.ai_strategy(self.player_board)
 if __name__ == "__main__":
     root = tk.Tk()
     app = GameApp(root)
@@ -0,0 +1,108 @@
+import random
+from bitboard import PLACEMENTS, _placements
+from chenakin_lab_navBatte import BOARD_SIZE, FLEET_SIZES
+# Расстановка флота без "3000 попыток": кандидаты на каждый корабль - заранее посчитанные
+# маски позиций, занятая область (корабли с ореолом) - одно число. Сначала берется случайная
+# позиция с проверкой по маске, если несколько раз подряд не повезло - перебираются только
+# допустимые позиции, а если их нет - откат к предыдущему кораблю
+TRIES = 12
+# Блоки 2x2: любые две клетки блока соседние, поэтому корабли не делят блоки,
+# и корабль длины L занимает не меньше (L + 1) // 2 блоков - оценка для отсечения
+BLOCKS = [sum(1 << ((y + dy) * BOARD_SIZE + x + dx) for dy in (0, 1) for dx in (0, 1)
+              if y + dy < BOARD_SIZE and x + dx < BOARD_SIZE)
+          for y in range(0, BOARD_SIZE, 2) for x in range(0, BOARD_SIZE, 2)]
+_CANDIDATES = {}
+def candidates(length):
+    # [(x, y, маска корабля, маска с ореолом, длина, горизонтально)]
+    if length not in _CANDIDATES:
+        items = []
+        for horizontal in (True, False) if length > 1 else (True,):
+            placed = PLACEMENTS.get((length, horizontal)) or _placements(length, horizontal)
+            items.extend((x, y, ship, halo, length, horizontal) for x, y, ship, halo in placed)
+        _CANDIDATES[length] = items
+    return _CANDIDATES[length]
+_PLANS = {}
+def _plan(sizes):
+    # для набора кораблей: (корабли по убыванию, [(кандидаты, их число)])
+    key = tuple(sizes)
+    if key not in _PLANS:
+        ordered = sorted(sizes, reverse=True)
+        _PLANS[key] = ordered, [(candidates(size), len(candidates(size))) for size in ordered]
+    return _PLANS[key]
+def _quick(plan, rng):
+    # Обычный случай: каждому кораблю хватает нескольких случайных проб
+    rand = rng.random
+    blocked = 0
+    fleet = []
+    for cands, n in plan:
+        if not n: return None
+        for _ in range(TRIES):
+            pick = cands[int(rand() * n)]
+            if not pick[2] & blocked: break
+        else:
+            return None
+        blocked |= pick[3]
+        fleet.append(pick)
+    return fleet
+def _search(sizes, rng, budget):
+    # Поиск с возвратом не больше чем на budget шагов: None - бюджет кончился,
+    # ValueError - перебор закончен и расстановки нет
+    chosen = []  # (позиция, занятая область до нее)
+    options = []  # по кораблям: оставшиеся допустимые позиции или None, если еще не перебирали
+    tried = []  # по кораблям: позиция, снятая при откате
+    blocked = 0
+    i = 0
+    while i < len(sizes):
+        budget -= 1
+        if budget < 0: return None
+        cands = candidates(sizes[i])
+        if len(options) == i:
+            options.append(None)
+            tried.append(None)
+            if cands:
+                n = len(cands)
+                for _ in range(TRIES):
+                    pick = cands[int(rng.random() * n)]
+                    if not pick[2] & blocked:
+                        chosen.append((pick, blocked))
+                        blocked |= pick[3]
+                        i += 1
+                        break
+                else:
+                    pick = None
+                if pick is not None: continue
+        if options[i] is None:
+            # одинаковые корабли перебираются только по возрастанию маски позиции,
+            # иначе откат ходил бы по всем перестановкам одной и той же расстановки
+            low = chosen[-1][0][2] if i and sizes[i - 1] == sizes[i] else 0
+            legal = [p for p in cands if p[2] > low and not p[2] & blocked and p is not tried[i]]
+            same = sizes.index(sizes[i]) + sizes.count(sizes[i]) - i  # сколько таких еще ставить
+            need = sum((size + 1) // 2 for size in sizes[i:])
+            if len(legal) < same or sum(1 for block in BLOCKS if block & ~blocked) < need: legal = []
+            options[i] = legal
+            rng.shuffle(options[i])
+        if options[i]:
+            pick = options[i].pop()
+            chosen.append((pick, blocked))
+            blocked |= pick[3]
+            i += 1
+            continue
+        # для этого корабля места нет - снимаем предыдущий
+        options.pop()
+        tried.pop()
+        if i == 0: raise ValueError("флот не помещается на поле")
+        i -= 1
+        tried[i], blocked = chosen.pop()
+    return [pick for pick, _ in chosen]
+def random_fleet(sizes=FLEET_SIZES, rng=random):
+    # Неудачные первые ходы могут завести в огромное безнадежное поддерево, поэтому поиск
+    # перезапускается с удвоенным бюджетом; бюджет растет без предела, так что для
+    # выполнимого флота ответ будет всегда, а для невыполнимого - ValueError
+    sizes, plan = _plan(sizes)
+    fleet = _quick(plan, rng)
+    if fleet is not None: return fleet
+    budget = 64 * len(sizes)
+    while True:
+        fleet = _search(sizes, rng, budget)
+        if fleet is not None: return fleet
+        budget *= 2
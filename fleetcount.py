@@ -0,0 +1,207 @@
+import random
+from collections import Counter
+from itertools import product
+from math import comb
+from chenakin_lab_navBatte import BOARD_SIZE, FLEET_SIZES
+# Точный подсчет расстановок флота по правилам can_place_ship (корабли прямые и не касаются
+# даже углами) с учетом известных выстрелов, и равномерный выбор одной из них.
+# Динамика по изломанному профилю: клетки обходятся по строкам, состояние - одно целое:
+# по 4 бита на столбец (код клетки над текущей или, левее текущей, уже в этой строке),
+# занята ли клетка сверху-слева и горизонтальный отрезок, идущий слева. Сколько кораблей
+# какой длины уже закончено, в состояние не входит: значение состояния - все такие счетчики
+# сразу, упакованные в одно большое целое (см. shift)
+BLOCKED = 7  # занятая клетка, под которой должно быть пусто: горизонтальный корабль или вертикальный полной длины
+ALL_HIT = 8  # флаг к длине вертикального отрезка 1..3: все его клетки - попадания (2)
+NO_RUN = 7  # клетка слева занята, но горизонтальный корабль с нее не продолжить
+class FleetCounter:
+    def __init__(self, grid=None, fleet=FLEET_SIZES):
+        # grid - то, что видно сопернику: -1 промах, 2 попадание, 3 потоплен, остальное неизвестно
+        self.size = len(grid) if grid is not None else BOARD_SIZE
+        self.known = [grid[y][x] if grid is not None else 0 for y in range(self.size) for x in range(self.size)]
+        need = Counter(fleet)
+        self.longest = max(need)
+        if self.longest > 4: raise ValueError("корабли длиннее 4 не поддерживаются")
+        self.need = tuple(need[length] for length in range(1, self.longest + 1))
+        # Ячейка на каждый набор (сколько закончено кораблей длины 1, 2, ...), цифры с основаниями
+        # need + 1. Ячейке хватает бит на наибольшее C(клеток, k): каждое продолжение - свое
+        # множество из k клеток, где k не больше клеток всего флота
+        cells = self.size * self.size
+        self.bits = max(comb(cells, k) for k in range(min(sum(fleet), cells) + 1)).bit_length()
+        self.strides = []
+        slots = 1
+        for count in self.need:
+            self.strides.append(slots)
+            slots *= count + 1
+        full = (1 << self.bits) - 1
+        self.keep = []  # по длине: ячейки, где к этой цифре еще можно прибавить корабль
+        for length, count in enumerate(self.need):
+            self.keep.append(sum(full << (self.index(digits) * self.bits)
+                                 for digits in product(*(range(c + 1) for c in self.need))
+                                 if digits[length] < count))
+        self.shift_by = [stride * self.bits for stride in self.strides]
+        self.width = 4 * self.size
+        # ход зависит только от столбцов j - 1, j, j + 1 и полей отрезка; остальное переносится как есть
+        self.local = [(0xFFF << (4 * (p % self.size) - 4) if p % self.size else 0xFF) & ((1 << self.width) - 1)
+                      | 31 << self.width for p in range(cells)]
+        self.tables = [{} for _ in range(cells)]
+        self.suffix = None
+    def index(self, digits):
+        return sum(digit * stride for digit, stride in zip(digits, self.strides))
+    def ways(self, vector, used):
+        # сколько продолжений в vector дают ровно недостающие до need корабли
+        rest = [count - u for count, u in zip(self.need, used)]
+        if min(rest) < 0: return 0
+        return vector >> (self.index(rest) * self.bits) & ((1 << self.bits) - 1)
+    def shift(self, vector, closed):
+        # добавить законченные корабли: ячейки, где цифра уже максимальна, отбрасываются
+        for length in closed:
+            vector = (vector & self.keep[length - 1]) << self.shift_by[length - 1]
+        return vector
+    def moves(self, p, state):
+        # [(занята ли клетка p, следующее состояние, длины законченных кораблей)] через таблицу
+        # ходов по соседству клетки; таблица заполняется по мере надобности
+        key = state & self.local[p]
+        table = self.tables[p]
+        moves = table.get(key)
+        if moves is None: moves = table[key] = self.local_moves(p, key)
+        rest = state ^ key
+        return [(occupied, rest | following, closed) for occupied, following, closed in moves]
+    def local_moves(self, p, state):
+        # ходы для состояния, где заданы только соседние столбцы и поля отрезка;
+        # корабль целиком из попаданий был бы потоплен, а не подбит, - такие ходы отбрасываются
+        size, width, longest = self.size, self.width, self.longest
+        j = p % size
+        shift = 4 * j
+        up = state >> shift & 15
+        upright = state >> (shift + 4) & 15 if j + 1 < size else 0
+        upleft = state >> width & 1
+        run = state >> (width + 1) & 7
+        run_hit = state >> (width + 4) & 1
+        profile = state & ((1 << width) - 1) & ~(15 << shift)
+        value = self.known[p]
+        result = []
+        if value != 2 and value != 3:
+            closed = ()
+            if up and up != BLOCKED: closed = None if up & ALL_HIT else (up & 7,)
+            if closed is not None and 2 <= run <= longest: closed = None if run_hit else closed + (run,)
+            if closed is not None: result.append((False, profile | (up != 0) << width, closed))
+        if value != -1 and not upleft and not upright:
+            hit = value == 2
+            closed = ()
+            if run:
+                # продолжение горизонтального отрезка: сверху пусто, слева - одиночная клетка или отрезок
+                if up or run == NO_RUN or run == longest: code = None
+                else:
+                    profile = profile & ~(15 << (shift - 4)) | BLOCKED << (shift - 4)
+                    code, run, run_hit = BLOCKED, run + 1, run_hit and hit
+            elif up:
+                if up == BLOCKED: code = None
+                else:
+                    length, all_hit = (up & 7) + 1, up & ALL_HIT and hit
+                    if length < longest: code = length | (ALL_HIT if all_hit else 0)
+                    elif all_hit: code = None
+                    else: code, closed = BLOCKED, (length,)
+                    run, run_hit = NO_RUN, 0
+            elif longest == 1:
+                code = None if hit else BLOCKED
+                closed, run, run_hit = (1,), NO_RUN, 0
+            else:
+                code, run, run_hit = 1 | (ALL_HIT if hit else 0), 1, hit
+            if code is not None:
+                result.append((True, profile | code << shift | (up != 0) << width | run << (width + 1)
+                               | run_hit << (width + 4), closed))
+        if j == size - 1:
+            # конец строки: горизонтальный отрезок закончен, у следующей клетки нет соседа сверху-слева
+            ended = []
+            for occupied, following, closed in result:
+                run = following >> (width + 1) & 7
+                if 2 <= run <= longest:
+                    if following >> (width + 4) & 1: continue
+                    closed = closed + (run,)
+                ended.append((occupied, following & ((1 << width) - 1), closed))
+            result = ended
+        return result
+    def finish(self, state):
+        # после последней строки заканчиваются все вертикальные отрезки; None - среди них есть подбитый целиком
+        closed = []
+        for j in range(self.size):
+            code = state >> (4 * j) & 15
+            if code and code != BLOCKED:
+                if code & ALL_HIT: return None
+                closed.append(code & 7)
+        return tuple(closed)
+    def row(self, i, states):
+        # состояния внутри строки i: [{состояние: ходы}] для каждой ее клетки
+        layers = []
+        for p in range(i * self.size, (i + 1) * self.size):
+            layer = {state: self.moves(p, state) for state in states}
+            layers.append(layer)
+            states = {following for moves in layer.values() for _, following, _ in moves}
+        return layers, states
+    def solve(self):
+        # Проход вперед запоминает состояния только на границах строк, проход назад
+        # пересчитывает строку заново и считает для каждого граничного состояния его продолжения
+        if self.suffix is not None: return
+        bounds = [{0}]
+        for i in range(self.size):
+            bounds.append(self.row(i, bounds[i])[1])
+        after = {}
+        for state in bounds[-1]:
+            closed = self.finish(state)
+            if closed is not None: after[state] = self.shift(1, closed)
+        self.suffix = [None] * self.size + [after]
+        for i in range(self.size - 1, -1, -1):
+            layers, _ = self.row(i, bounds[i])
+            for layer in reversed(layers):
+                current = {}
+                for state, moves in layer.items():
+                    vector = 0
+                    for _, following, closed in moves:
+                        following = after.get(following)
+                        if following: vector += self.shift(following, closed)
+                    if vector: current[state] = vector
+                after = current
+            self.suffix[i] = after
+    def count(self):
+        self.solve()
+        return self.ways(self.suffix[0].get(0, 0), (0,) * self.longest)
+    def sample(self, rng=random):
+        # равномерно случайная расстановка: [(x, y, длина, горизонтально)]
+        if not self.count(): raise ValueError("нет ни одной допустимой расстановки")
+        state = 0
+        used = [0] * self.longest
+        occupied = set()
+        for i in range(self.size):
+            memo = {}
+            leaves = self.suffix[i + 1]
+            def completions(p, state):
+                # продолжения с клетки p внутри строки i, листья - граничные вектора следующей строки
+                if p == (i + 1) * self.size: return leaves.get(state, 0)
+                if (p, state) not in memo:
+                    memo[p, state] = sum(self.shift(completions(p + 1, following), closed)
+                                         for _, following, closed in self.moves(p, state))
+                return memo[p, state]
+            for p in range(i * self.size, (i + 1) * self.size):
+                options = []
+                for cell, following, closed in self.moves(p, state):
+                    after = list(used)
+                    for length in closed:
+                        after[length - 1] += 1
+                    options.append((self.ways(completions(p + 1, following), after), cell, following, after))
+                pick = rng.randrange(sum(option[0] for option in options))
+                for ways, cell, following, after in options:
+                    if pick < ways: break
+                    pick -= ways
+                if cell: occupied.add((p % self.size, p // self.size))
+                state, used = following, after
+        return ships_of(occupied)
+def ships_of(occupied):
+    fleet = []
+    for x, y in sorted(occupied, key=lambda cell: (cell[1], cell[0])):
+        if (x - 1, y) in occupied or (x, y - 1) in occupied: continue  # не первая клетка корабля
+        length = 1
+        horizontal = (x + 1, y) in occupied
+        while (x + length, y) in occupied if horizontal else (x, y + length) in occupied:
+            length += 1
+        fleet.append((x, y, length, horizontal))
+    return fleet
@@ -0,0 +1,103 @@
+import mmap
+from bitboard import cells_of, masks_of
+from chenakin_lab_navBatte import BOARD_SIZE, Board
+# Двоичный журнал партий: сигнатура, затем записи полей подряд. Запись поля - байт GAME,
+# число кораблей, по 2 байта на корабль (номер клетки y*BOARD_SIZE + x; длина << 1 | горизонтально)
+# и по байту на выстрел в порядке выстрелов. Выстрелы дописываются по одному, конец записи -
+# следующий байт GAME или конец файла. Стандартный флот и 50 выстрелов - около 70 байт.
+# Номер клетки занимает байт и должен быть меньше GAME, поэтому поле не больше 15x15
+MAGIC = b'BSL1'
+GAME = 0xFE
+_GAME = bytes((GAME,))
+_XY = [(k % BOARD_SIZE, k // BOARD_SIZE) for k in range(BOARD_SIZE * BOARD_SIZE)]
+def fleet_of(board):
+    # [(x, y, длина, горизонтально)] для Board, BitBoard и SparseBoard
+    ships = board.ships.values() if isinstance(board.ships, dict) else board.ships
+    fleet = []
+    for ship in ships:
+        cells = cells_of(ship) if isinstance(ship, int) else ship
+        x, y = min(cells, key=lambda cell: (cell[1], cell[0]))
+        fleet.append((x, y, len(cells), len(cells) > 1 and all(cy == y for _, cy in cells)))
+    return fleet
+def encode_fleet(fleet):
+    out = bytearray((GAME, len(fleet)))
+    for x, y, length, horizontal in fleet:
+        out += bytes((y * BOARD_SIZE + x, length << 1 | bool(horizontal)))
+    return bytes(out)
+def encode(fleet, shots=()):
+    return encode_fleet(fleet) + bytes(y * BOARD_SIZE + x for x, y in shots)
+def records(data, offset=0):
+    # (байты кораблей, байты выстрелов) для каждой записи, без копирования разбора по полям
+    end = len(data)
+    while offset < end:
+        if data[offset] != GAME: raise ValueError(f"испорченная запись на смещении {offset}")
+        ships = data[offset + 2:offset + 2 + 2 * data[offset + 1]]
+        offset += 2 + len(ships)
+        stop = data.find(_GAME, offset)
+        if stop < 0: stop = end
+        yield ships, data[offset:stop]
+        offset = stop
+def decode(ships, shots):
+    fleet = [_XY[ships[p]] + (ships[p + 1] >> 1, bool(ships[p + 1] & 1)) for p in range(0, len(ships), 2)]
+    return fleet, [_XY[k] for k in shots]
+def replay(ships, shots, board_class=Board):
+    board = board_class()
+    for p in range(0, len(ships), 2):
+        x, y = _XY[ships[p]]
+        if not board.place_ship(x, y, ships[p + 1] >> 1, ships[p + 1] & 1):
+            raise ValueError(f"корабль {x}, {y} не ставится")
+    shoot = board.shoot
+    for k in shots:
+        shoot(*_XY[k])
+    return board
+def verify(ships, shots):
+    # Проверка записи без построения поля, на масках: корабли не касаются друг друга,
+    # выстрелы не повторяются и не идут в открытый ореол потопленного.
+    # (число выстрелов, потоплен ли весь флот)
+    occupied = 0
+    fleet = []
+    for p in range(0, len(ships), 2):
+        masks = masks_of(*_XY[ships[p]], ships[p + 1] >> 1, bool(ships[p + 1] & 1))
+        if masks is None or masks[1] & occupied: raise ValueError(f"корабль {_XY[ships[p]]} не ставится")
+        occupied |= masks[0]
+        fleet.append(masks)
+    opened = 0  # клетки с выстрелом и ореолы потопленных
+    for k in shots:
+        bit = 1 << k
+        if bit & opened: raise ValueError(f"повторный выстрел в {_XY[k]}")
+        opened |= bit
+        if bit & occupied:
+            for ship, halo in fleet:
+                if bit & ship:
+                    if not ship & ~opened: opened |= halo
+                    break
+    return len(shots), not occupied & ~opened
+class MoveLog:
+    # Дописываемый журнал: start(board) в начале партии, shot(x, y) после каждого выстрела
+    def __init__(self, path):
+        self.file = open(path, 'ab+')
+        self.file.seek(0)
+        head = self.file.read(len(MAGIC))
+        if not head: self.file.write(MAGIC)
+        elif head != MAGIC:
+            self.file.close()
+            raise ValueError(f"{path}: не журнал партий")
+    def start(self, board):
+        self.file.write(encode_fleet(fleet_of(board)))
+    def shot(self, x, y):
+        self.file.write(bytes((y * BOARD_SIZE + x,)))
+    def flush(self):
+        self.file.flush()
+    def close(self):
+        self.file.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+def read_log(path):
+    # записи журнала по одной через mmap; поле из записи строит replay
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC: raise ValueError(f"{path}: не журнал партий")
+        if f.seek(0, 2) == len(MAGIC): return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from records(data, len(MAGIC))
@@ -1,4 +1,9 @@
+import sys
 import tkinter as tk
+from maze_format import load
+from maze_solver import record
+from maze_view import CellRenderer, TraversalPlayer, ViewportRenderer
+from maze_paths import DistanceField
 # 0 - стена, 1 - путь, S - вход, E - выход
 maze = [
     ['0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0'],
@@ -22,46 +27,34 @@ maze = [
     ['0','1','0','0','0','0','1','0','1','0','1','0','1','0','0','0','0','0','E','0'],
     ['0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0','0'],
 ]
-n, m = len(maze), len(maze[0])
-cell = 20
-root = tk.Tk()
-c = tk.Canvas(root, width=m*cell, height=n*cell)
-c.pack()
-start_i = start_j = None
-visited = []  
-def find_start():
-    global start_i, start_j
-    for i in range(n):
-        for j in range(m):
-            if maze[i][j] == 'S':
-                start_i, start_j = i, j
-                return True
-    return False
-def draw():
-    c.delete("all")
-    for i in range(n):
-        for j in range(m):
-            v = maze[i][j]
-            if v == '0':color = "black"  
-            elif v == 'E':color = "green" if (i, j) in visited else "red"
-            else:color = "orange" if (i, j) in visited else "white" 
-            if start_i is not None and i == start_i and j == start_j:color = "blue"  
-            x1, y1 = j*cell, i*cell
-            c.create_rectangle(x1, y1, x1+cell, y1+cell,
-                               fill=color, outline="gray")
-def dfs(i, j):
-    if maze[i][j] == '0' or (i, j) in visited:return 0
-    visited.append((i, j))  
-    exits = 1 if maze[i][j] == 'E' else 0
-    draw()
-    root.after(50)
-    root.update()
-    for di, dj in ((1,0),(-1,0),(0,1),(0,-1)):
-        ni, nj = i + di, j + dj
-        if 0 <= ni < n and 0 <= nj < m:exits += dfs(ni, nj)
-    return exits
-if find_start():
-    draw()
-    found_exits = dfs(start_i, start_j)
-    print("Найдено выходов:", found_exits)
-root.mainloop()
+def main(maze=maze):
+    n, m = len(maze), len(maze[0])
+    cell = 20
+    root = tk.Tk()
+    c = tk.Canvas(root, width=min(m*cell, 800), height=min(n*cell, 600))
+    c.pack()
+    # Большой лабиринт рисуется только в пределах окна, перетаскивание мышью и колесо - масштаб
+    if n*cell > 600 or m*cell > 800:view = ViewportRenderer(c, maze, 800, 600)
+    else:view = CellRenderer(c, maze, cell)
+    # Решение на полной скорости, анимация - отдельное проигрывание журнала
+    log = record(maze)
+    print("Найдено выходов:", sum(1 for k in log if k < 0))
+    field = DistanceField.from_start(maze)
+    def show_path():
+        if field.exits:
+            # Кратчайший путь до ближайшего выхода
+            view.highlight(field.path_to_exit(0)[1:-1])
+            print("Ближайший выход:", field.nearest_exit(), "шагов:", field.distance(*field.nearest_exit()))
+    player = TraversalPlayer(root, view, log, on_finish=show_path)
+    # Пробел - пауза, стрелки - перемотка, +/- - скорость
+    root.bind("<space>", lambda e: player.toggle())
+    root.bind("<Right>", lambda e: player.skip(10))
+    root.bind("<Left>", lambda e: player.skip(-10))
+    root.bind("<plus>", lambda e: player.set_speed(player.speed * 2))
+    root.bind("<equal>", lambda e: player.set_speed(player.speed * 2))
+    root.bind("<minus>", lambda e: player.set_speed(player.speed / 2))
+    player.play()
+    root.mainloop()
+if __name__ == "__main__":
+    # python maze.py [файл.txt | файл.mz]
+    main(load(sys.argv[1]) if len(sys.argv) > 1 else maze)
@@ -0,0 +1,51 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from maze_format import PackedMaze, load
+from maze_solver import solve
+# Пакетная проверка лабиринтов: python maze_batch.py mazes/ "extra/*.mz" -j 8 > results.jsonl
+EXTENSIONS = ('.txt', '.maze', '.mz')
+def collect(patterns):
+    # папка и пересекающийся с ней шаблон дают файл один раз, в порядке первой встречи
+    files, seen = [], set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = [os.path.join(pattern, name) for name in sorted(os.listdir(pattern)) if name.endswith(EXTENSIONS)]
+        else:
+            found = sorted(glob.glob(pattern))
+        for path in found:
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen.add(key)
+                files.append(path)
+    return files
+def check(path):
+    began = time.perf_counter()
+    try:
+        grid = load(path)
+        try:
+            exits, visited = solve(grid)
+        finally:
+            if isinstance(grid, PackedMaze): grid.close()
+    except (OSError, ValueError, IndexError) as e:
+        return {"file": path, "error": str(e)}
+    return {"file": path, "exits": len(exits), "visited": visited,
+            "time": round(time.perf_counter() - began, 6)}
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный поиск выходов в лабиринтах")
+    parser.add_argument("paths", nargs="+", help="папки или шаблоны файлов (*.txt, *.mz)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="число процессов")
+    args = parser.parse_args(argv)
+    files = collect(args.paths)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # строки выводятся в порядке завершения, а не в порядке файлов
+        for future in as_completed([pool.submit(check, path) for path in files]):
+            sys.stdout.write(json.dumps(future.result(), ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from maze_gen import KINDS, generate
+from maze_graph import JunctionGraph
+from maze_parallel import count_exits as parallel_count
+from maze_paths import DistanceField
+from maze_solver import count_exits, record
+from maze_stream import count_exits_stream
+# Замеры решателей на сгенерированных лабиринтах:
+# python maze_bench.py --sizes 100 1000 --out bench.json --baseline old.json
+SOLVERS = {
+    "maze.py": lambda grid: sum(1 for k in record(grid) if k < 0),
+    "dfs": count_exits,
+    "bfs-field": lambda grid: len(DistanceField.from_start(grid).exits),
+    "stream": count_exits_stream,
+    "graph": lambda grid: JunctionGraph.build(grid).count_exits(),
+    "parallel": parallel_count,
+}
+try:
+    import maze_numpy
+    SOLVERS["numpy"] = maze_numpy.count_exits
+except ImportError:
+    pass
+def measure(solver, grid, memory=True):
+    began = time.perf_counter()
+    exits = solver(grid)
+    seconds = time.perf_counter() - began
+    peak = None
+    if memory:
+        # отдельный прогон: трассировка памяти сама замедляет решатель
+        tracemalloc.start()
+        solver(grid)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return exits, seconds, peak
+def revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+def run(sizes, kinds, solvers, seed=1, exits=5, memory=True):
+    results = []
+    for size in sizes:
+        for kind in kinds:
+            grid = generate(size, size, kind, exits, seed)
+            answers = set()
+            for name in solvers:
+                found, seconds, peak = measure(SOLVERS[name], grid, memory)
+                answers.add(found)
+                results.append({"size": size, "kind": kind, "solver": name, "exits": found,
+                                "seconds": round(seconds, 6),
+                                "cells_per_sec": round(size * size / seconds) if seconds else None,
+                                "peak_mb": round(peak / 2**20, 3) if peak is not None else None})
+                print(f"{size:>6} {kind:<8} {name:<10} {seconds:9.4f} s "
+                      f"{results[-1]['cells_per_sec'] or 0:>12} клеток/с "
+                      f"{results[-1]['peak_mb'] if peak is not None else '-':>9} МБ", file=sys.stderr)
+            if len(answers) > 1: print(f"расхождение ответов на {size} {kind}: {answers}", file=sys.stderr)
+    return results
+def compare(results, baseline, threshold=1.2):
+    # строки, ставшие медленнее базового замера больше чем в threshold раз
+    old = {(r["size"], r["kind"], r["solver"]): r["seconds"] for r in baseline["results"]}
+    slower = []
+    for r in results:
+        before = old.get((r["size"], r["kind"], r["solver"]))
+        if before and r["seconds"] > before * threshold:
+            slower.append((r, r["seconds"] / before))
+    return slower
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры решателей лабиринта")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--exits", type=int, default=5)
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--baseline", help="прошлый файл результатов для поиска регрессий")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, args.kinds, args.solvers, args.seed, args.exits, not args.no_memory)
+    with open(args.out, "w") as f:
+        json.dump({"revision": revision(), "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "seed": args.seed, "results": results}, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = compare(results, json.load(f))
+        for r, ratio in slower:
+            print(f"регрессия: {r['size']} {r['kind']} {r['solver']} медленнее в {ratio:.2f} раза", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
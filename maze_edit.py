@@ -0,0 +1,170 @@
+import sys
+import time
+import tkinter as tk
+from maze_solver import WALL, PATH, START, EXIT, pad, find_start
+from maze_view import CellRenderer, ViewportRenderer
+# Редактируемый лабиринт: число выходов, достижимых из S, пересчитывается после каждой правки.
+# Открытие клетки сливает компоненты системой непересекающихся множеств, а новая стена
+# запускает параллельные обходы от ее соседей: если соседи разошлись по разным частям,
+# меньшая часть получает новую метку, и обходится только она
+class EditableMaze:
+    def __init__(self, grid):
+        cells, self.n, self.m = pad(grid)
+        self.cells = bytearray(cells)
+        self.w = w = self.m + 1
+        self.grid = [[chr(v) for v in cells[(i + 1) * w:(i + 2) * w - 1]] for i in range(self.n)]
+        start = find_start(grid)
+        self.start = (start[0] + 1) * w + start[1] if start is not None else None
+        self.node = [-1] * len(cells)  # клетка -> элемент системы множеств
+        self.parent = []
+        self.exits = []  # число выходов в множестве (верно только у корня)
+        for k in range(w, len(cells) - w):
+            if self.cells[k] == WALL: continue
+            self.node[k] = self.new_set(1 if self.cells[k] == EXIT else 0)
+            for nk in (k - 1, k - w):
+                if self.cells[nk] != WALL: self.union(k, nk)
+    def new_set(self, exits):
+        self.parent.append(len(self.parent))
+        self.exits.append(exits)
+        return len(self.parent) - 1
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent[root] != root: root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+    def union(self, a, b):
+        x, y = self.find(self.node[a]), self.find(self.node[b])
+        if x == y: return
+        self.parent[x] = y
+        self.exits[y] += self.exits[x]
+    def index(self, i, j):
+        return (i + 1) * self.w + j
+    def count_exits(self):
+        if self.start is None: return 0
+        return self.exits[self.find(self.node[self.start])]
+    def set_cell(self, i, j, value):
+        # value - один из символов '0', '1', 'E'; вход S переносится через move_start
+        k = self.index(i, j)
+        old, new = self.cells[k], ord(value)
+        if old == new or old == START or new == START: return False
+        self.grid[i][j] = value
+        if old == WALL:
+            self.cells[k] = new
+            self.node[k] = self.new_set(1 if new == EXIT else 0)
+            for nk in (k - 1, k + 1, k - self.w, k + self.w):
+                if self.cells[nk] != WALL: self.union(k, nk)
+        elif new == WALL:
+            root = self.find(self.node[k])
+            if old == EXIT: self.exits[root] -= 1
+            self.cells[k] = WALL
+            self.node[k] = -1
+            self.split(root, [nk for nk in (k - 1, k + 1, k - self.w, k + self.w) if self.cells[nk] != WALL])
+        else:
+            self.cells[k] = new
+            self.exits[self.find(self.node[k])] += 1 if new == EXIT else -1
+        return True
+    def split(self, root, seeds):
+        # Обходы от каждого соседа идут по очереди по одной клетке; встретившиеся обходы
+        # объединяются, а закончившийся в одиночку обход - это отколовшаяся часть
+        if len(seeds) < 2: return
+        cells, w = self.cells, self.w
+        owner = {k: g for g, k in enumerate(seeds)}
+        group = list(range(len(seeds)))
+        def top(g):
+            while group[g] != g: g = group[g]
+            return g
+        frontiers = [[k] for k in seeds]
+        members = [[k] for k in seeds]
+        active = set(range(len(seeds)))
+        while len(active) > 1:
+            for g in list(active):
+                if g not in active: continue
+                if not frontiers[g]:
+                    # часть g отделилась: новая метка только для ее клеток
+                    exits = sum(1 for k in members[g] if cells[k] == EXIT)
+                    piece = self.new_set(exits)
+                    for k in members[g]: self.node[k] = piece
+                    self.exits[root] -= exits
+                    active.discard(g)
+                    if len(active) == 1: break
+                    continue
+                k = frontiers[g].pop()
+                for nk in (k - 1, k + 1, k - w, k + w):
+                    if cells[nk] == WALL: continue
+                    other = owner.get(nk)
+                    if other is None:
+                        owner[nk] = g
+                        frontiers[g].append(nk)
+                        members[g].append(nk)
+                    else:
+                        h = top(other)
+                        if h != g:
+                            # обходы встретились - это одна часть, сливаем в g
+                            group[h] = g
+                            frontiers[g].extend(frontiers[h])
+                            members[g].extend(members[h])
+                            frontiers[h], members[h] = [], []
+                            active.discard(h)
+    def toggle_wall(self, i, j):
+        return self.set_cell(i, j, '1' if self.grid[i][j] == '0' else '0')
+    def toggle_exit(self, i, j):
+        if self.grid[i][j] == '0': return False
+        return self.set_cell(i, j, '1' if self.grid[i][j] == 'E' else 'E')
+    def move_start(self, i, j):
+        k = self.index(i, j)
+        if self.cells[k] == WALL: return False
+        if self.cells[k] == EXIT: self.set_cell(i, j, '1')
+        if self.start is not None:
+            si, sj = divmod(self.start, self.w)
+            self.cells[self.start] = PATH
+            self.grid[si - 1][sj] = '1'
+        self.start = k
+        self.cells[k] = START
+        self.grid[i][j] = 'S'
+        return True
+class EditorApp:
+    # ЛКМ - стена/проход, ПКМ - выход, Shift+ЛКМ - перенести вход
+    def __init__(self, root, grid, cell=20):
+        self.root = root
+        self.root.title("Редактор лабиринта")
+        self.maze = EditableMaze(grid)
+        n, m = self.maze.n, self.maze.m
+        self.canvas = tk.Canvas(root, width=min(m*cell, 800), height=min(n*cell, 600))
+        self.canvas.pack()
+        if n*cell > 600 or m*cell > 800:self.view = ViewportRenderer(self.canvas, self.maze.grid, 800, 600)
+        else:self.view = CellRenderer(self.canvas, self.maze.grid, cell)
+        self.status = tk.StringVar()
+        tk.Label(root, textvariable=self.status).pack()
+        self.canvas.bind("<ButtonRelease-1>", self.on_left)
+        self.canvas.bind("<Shift-ButtonRelease-1>", self.on_shift_left)
+        self.canvas.bind("<Button-3>", self.on_right)
+        self.show(0.0)
+    def edit(self, event, action):
+        cell = self.view.cell_at(event.x, event.y)
+        if cell is None or getattr(self.view, "moved", False): return
+        began = time.perf_counter()
+        old_start = self.maze.start
+        if action(*cell):
+            elapsed = time.perf_counter() - began
+            self.view.refresh(*cell)
+            if old_start is not None and old_start != self.maze.start:
+                si, sj = divmod(old_start, self.maze.w)
+                self.view.refresh(si - 1, sj)
+            self.show(elapsed)
+    def show(self, elapsed):
+        self.status.set(f"Найдено выходов: {self.maze.count_exits()}   правка: {elapsed * 1000:.3f} мс")
+    def on_left(self, event):
+        self.edit(event, self.maze.toggle_wall)
+    def on_shift_left(self, event):
+        self.edit(event, self.maze.move_start)
+    def on_right(self, event):
+        self.edit(event, self.maze.toggle_exit)
+if __name__ == "__main__":
+    # python maze_edit.py [файл.txt | файл.mz]
+    from maze import maze
+    from maze_format import load
+    root = tk.Tk()
+    app = EditorApp(root, load(sys.argv[1]) if len(sys.argv) > 1 else maze)
+    root.mainloop()
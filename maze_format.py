@@ -0,0 +1,91 @@
+import mmap
+import struct
+from maze_solver import _row_bytes
+# Двоичный формат лабиринта: заголовок, таблицы входов и выходов, затем клетки по 2 бита
+# (0 - стена, 1 - путь, 2 - вход, 3 - выход), 4 клетки на байт, младшие биты - левая клетка,
+# каждая строка дополнена до целого байта
+MAGIC = b'MAZ2'
+HEADER = struct.Struct('<4sIIII')  # сигнатура, n, m, число входов, число выходов
+CELL = struct.Struct('<II')
+_CODE = {ord('1'): 1, ord('S'): 2, ord('E'): 3}
+_ENCODE = [bytes(_CODE.get(b, 0) << (2 * p) for b in range(256)) for p in range(4)]
+_DECODE = [bytes(b'01SE'[(b >> (2 * p)) & 3] for b in range(256)) for p in range(4)]
+def _pack_row(row):
+    row = row + b'0' * (-len(row) % 4)
+    packed = 0
+    for p in range(4):
+        packed |= int.from_bytes(row[p::4].translate(_ENCODE[p]), 'little')
+    return packed.to_bytes(len(row) // 4, 'little')
+def _unpack_row(packed, m):
+    out = bytearray(4 * len(packed))
+    for p in range(4):
+        out[p::4] = packed.translate(_DECODE[p])
+    return bytes(out[:m])
+def save(path, grid):
+    rows = [_row_bytes(row) for row in grid]
+    n, m = len(rows), len(rows[0]) if rows else 0
+    starts = [(i, j) for i, row in enumerate(rows) for j in _find_all(row, b'S')]
+    exits = [(i, j) for i, row in enumerate(rows) for j in _find_all(row, b'E')]
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, n, m, len(starts), len(exits)))
+        for i, j in starts + exits:
+            f.write(CELL.pack(i, j))
+        for row in rows:
+            f.write(_pack_row(row))
+def _find_all(row, ch):
+    j = row.find(ch)
+    while j != -1:
+        yield j
+        j = row.find(ch, j + 1)
+class PackedMaze:
+    # Лабиринт из файла через mmap: строки распаковываются по требованию,
+    # поэтому его можно передавать в maze_solver как обычную сетку
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise
+        if len(self.data) < HEADER.size or self.data[:4] != MAGIC:
+            self.close()
+            raise ValueError("не файл лабиринта: " + str(path))
+        magic, self.n, self.m, n_starts, n_exits = HEADER.unpack_from(self.data, 0)
+        cells = [CELL.unpack_from(self.data, HEADER.size + CELL.size * k) for k in range(n_starts + n_exits)]
+        self.starts, self.exits = cells[:n_starts], cells[n_starts:]
+        self.offset = HEADER.size + CELL.size * len(cells)
+        self.row_size = (self.m + 3) // 4
+        if len(self.data) < self.offset + self.n * self.row_size:
+            self.close()
+            raise ValueError("файл лабиринта обрезан: " + str(path))
+    def __len__(self):
+        return self.n
+    def __getitem__(self, i):
+        if i < 0: i += self.n
+        if not 0 <= i < self.n: raise IndexError(i)
+        k = self.offset + i * self.row_size
+        return _unpack_row(self.data[k:k + self.row_size], self.m)
+    def __iter__(self):
+        for i in range(self.n):
+            yield self[i]
+    def cell(self, i, j):
+        k = self.offset + i * self.row_size + j // 4
+        return b'01SE'[(self.data[k] >> (2 * (j % 4))) & 3]
+    def close(self):
+        self.data.close()
+        self.file.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+def save_text(path, grid):
+    with open(path, 'wb') as f:
+        for row in grid:
+            f.write(_row_bytes(row) + b'\n')
+def load_text(path):
+    # Текстовый формат: одна строка файла - одна строка лабиринта из символов 0/1/S/E
+    with open(path, 'rb') as f:
+        return [line.strip() for line in f if line.strip()]
+def load(path):
+    if str(path).endswith('.mz'): return PackedMaze(path)
+    return load_text(path)
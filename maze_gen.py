@@ -0,0 +1,69 @@
+import argparse
+import random
+from maze_format import save, save_text
+# Генератор лабиринтов с зерном: perfect - ровно один путь между любыми клетками,
+# braided - часть тупиков пробита и появляются петли, rooms - плюс открытые комнаты.
+# Клетки-комнаты стоят на нечетных координатах, стены между ними - на четных
+KINDS = ("perfect", "braided", "rooms")
+def generate(n, m, kind="perfect", exits=1, seed=None, loops=0.5, rooms=None):
+    if kind not in KINDS: raise ValueError("неизвестный вид лабиринта: " + kind)
+    if n < 3 or m < 3: raise ValueError("лабиринт меньше 3x3")
+    rng = random.Random(seed)
+    g = bytearray(b'0') * (n * m)
+    rows, cols = (n - 1) // 2, (m - 1) // 2  # комнаты на нечетных координатах
+    def at(r, c):
+        return (2 * r + 1) * m + 2 * c + 1
+    # Итеративный поиск с возвратом: стек вместо рекурсии
+    stack = [(0, 0)]
+    g[at(0, 0)] = 49
+    steps = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc, dr, dc) for dr, dc in steps
+                   if 0 <= r + dr < rows and 0 <= c + dc < cols and g[at(r + dr, c + dc)] == 48]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc, dr, dc = options[rng.randrange(len(options))]
+        g[at(r, c) + dr * m + dc] = 49
+        g[at(nr, nc)] = 49
+        stack.append((nr, nc))
+    if kind in ("braided", "rooms"):
+        # в тупике пробиваем одну из стен с вероятностью loops
+        for r in range(rows):
+            for c in range(cols):
+                k = at(r, c)
+                if sum(1 for dr, dc in steps if g[k + dr * m + dc] == 49) != 1 or rng.random() >= loops: continue
+                walls = [(dr, dc) for dr, dc in steps
+                         if 0 <= r + dr < rows and 0 <= c + dc < cols and g[k + dr * m + dc] == 48]
+                if walls:
+                    dr, dc = walls[rng.randrange(len(walls))]
+                    g[k + dr * m + dc] = 49
+    if kind == "rooms":
+        count = rooms if rooms is not None else max(1, rows * cols // 400)
+        for _ in range(count):
+            h, w = rng.randint(2, max(2, min(8, rows // 2))), rng.randint(2, max(2, min(8, cols // 2)))
+            r0, c0 = rng.randrange(max(1, rows - h)), rng.randrange(max(1, cols - w))
+            x1, x2 = 2 * c0 + 1, min(2 * (c0 + w), m - 1)
+            for i in range(2 * r0 + 1, min(2 * (r0 + h), n - 1)):
+                g[i * m + x1:i * m + x2] = b'1' * (x2 - x1)
+    g[at(0, 0)] = ord('S')
+    total = rows * cols
+    for cell in rng.sample(range(1, total), min(exits, total - 1)):
+        g[at(*divmod(cell, cols))] = ord('E')
+    return [bytes(g[i * m:(i + 1) * m]) for i in range(n)]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Генератор лабиринтов")
+    parser.add_argument("n", type=int)
+    parser.add_argument("m", type=int)
+    parser.add_argument("out", help="файл .mz (упакованный) или текстовый")
+    parser.add_argument("--kind", choices=KINDS, default="perfect")
+    parser.add_argument("--exits", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--loops", type=float, default=0.5)
+    args = parser.parse_args(argv)
+    grid = generate(args.n, args.m, args.kind, args.exits, args.seed, args.loops)
+    if args.out.endswith(".mz"): save(args.out, grid)
+    else: save_text(args.out, grid)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import hashlib
+import heapq
+import pickle
+from collections import deque
+from maze_solver import EXIT, START, _BLOCKED, pad, find_start
+# Сжатие лабиринта в граф развилок: коридоры (клетки ровно с двумя открытыми соседями)
+# становятся взвешенными ребрами между развилками, тупиками, S и E, а тупиковые ветки
+# без выходов отбрасываются. Вершина - номер клетки i*m + j, вес ребра - число шагов
+def _fingerprint(cells, n, m):
+    return n, m, hashlib.blake2b(cells, digest_size=16).hexdigest()
+def fingerprint(grid):
+    # размеры и хеш клеток: по нему cached() узнает, что файл построен для этой же сетки
+    return _fingerprint(*pad(grid))
+class JunctionGraph:
+    def __init__(self, n, m, start, exits, adjacency, fingerprint=None):
+        self.n, self.m = n, m
+        self.start = start
+        self.exits = exits
+        self.adjacency = adjacency
+        self.fingerprint = fingerprint
+    @classmethod
+    def build(cls, grid):
+        cells, n, m = pad(grid)
+        w = m + 1
+        blocked = cells.translate(_BLOCKED)
+        def node_id(k):
+            return k - w - k // w + 1
+        start = find_start(grid)
+        start = (start[0] + 1) * w + start[1] if start is not None else None
+        exits = []
+        nodes = set()
+        for k in range(w, len(cells) - w):
+            if blocked[k]: continue
+            v = cells[k]
+            if v == EXIT: exits.append(k)
+            if v in (EXIT, START) or 4 - blocked[k - 1] - blocked[k + 1] - blocked[k - w] - blocked[k + w] != 2:
+                nodes.add(k)
+        if start is not None: nodes.add(start)
+        adjacency = {node_id(k): {} for k in nodes}
+        for u in nodes:
+            for first in (u - w, u + w, u - 1, u + 1):
+                if blocked[first]: continue
+                prev, cur, steps = u, first, 1
+                while cur not in nodes:
+                    for nk in (cur - w, cur + w, cur - 1, cur + 1):
+                        if nk != prev and not blocked[nk]: break
+                    prev, cur = cur, nk
+                    steps += 1
+                a, b = node_id(u), node_id(cur)
+                if a != b and steps < adjacency[a].get(b, steps + 1):
+                    adjacency[a][b] = adjacency[b][a] = steps
+        graph = cls(n, m, node_id(start) if start is not None else None,
+                    [node_id(k) for k in exits], adjacency, _fingerprint(cells, n, m))
+        graph.prune()
+        return graph
+    def prune(self):
+        # Убираем тупики без выходов, затем склеиваем проходные развилки в одно ребро
+        adjacency = self.adjacency
+        keep = set(self.exits)
+        if self.start is not None: keep.add(self.start)
+        queue = deque(u for u in adjacency if u not in keep and len(adjacency[u]) <= 2)
+        while queue:
+            u = queue.popleft()
+            if u not in adjacency: continue
+            near = adjacency[u]
+            if len(near) <= 1:
+                for v in near:
+                    del adjacency[v][u]
+                    if v not in keep and len(adjacency[v]) <= 2: queue.append(v)
+                del adjacency[u]
+            elif len(near) == 2:
+                (a, wa), (b, wb) = near.items()
+                del adjacency[a][u], adjacency[b][u], adjacency[u]
+                if wa + wb < adjacency[a].get(b, wa + wb + 1):
+                    adjacency[a][b] = adjacency[b][a] = wa + wb
+                for v in (a, b):
+                    if v not in keep and len(adjacency[v]) <= 2: queue.append(v)
+    def cell(self, node):
+        return divmod(node, self.m)
+    def reachable_exits(self):
+        if self.start is None: return []
+        seen = {self.start}
+        queue = deque([self.start])
+        while queue:
+            u = queue.popleft()
+            for v in self.adjacency[u]:
+                if v not in seen:
+                    seen.add(v)
+                    queue.append(v)
+        return [self.cell(e) for e in self.exits if e in seen]
+    def count_exits(self):
+        return len(self.reachable_exits())
+    def shortest_paths(self):
+        # Дейкстра от S по сжатому графу: {выход (i, j): (длина в шагах, путь по вершинам)}
+        if self.start is None: return {}
+        dist = {self.start: 0}
+        parent = {self.start: None}
+        heap = [(0, self.start)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]: continue
+            for v, weight in self.adjacency[u].items():
+                if d + weight < dist.get(v, d + weight + 1):
+                    dist[v] = d + weight
+                    parent[v] = u
+                    heapq.heappush(heap, (d + weight, v))
+        result = {}
+        for e in self.exits:
+            if e not in dist: continue
+            route, u = [], e
+            while u is not None:
+                route.append(self.cell(u))
+                u = parent[u]
+            result[self.cell(e)] = (dist[e], route[::-1])
+        return result
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump((self.n, self.m, self.start, self.exits, self.adjacency, self.fingerprint), f,
+                        pickle.HIGHEST_PROTOCOL)
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(*pickle.load(f))
+    @classmethod
+    def cached(cls, grid, path):
+        # Повторные запросы берут граф из файла, если он построен для этой же сетки
+        # (сверяются размеры и хеш клеток), иначе граф строится заново и файл перезаписывается
+        try:
+            graph = cls.load(path)
+            if graph.fingerprint == fingerprint(grid): return graph
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, TypeError, ValueError):
+            pass
+        graph = cls.build(grid)
+        graph.save(path)
+        return graph
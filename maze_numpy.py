@@ -0,0 +1,64 @@
+import numpy as np
+from maze_solver import _row_bytes
+# Коды клеток в массиве: 0 - стена, 1 - путь, 2 - вход, 3 - выход
+WALL, PATH, START, EXIT = 0, 1, 2, 3
+_CODES = np.zeros(256, dtype=np.uint8)
+_CODES[ord('1')], _CODES[ord('S')], _CODES[ord('E')] = PATH, START, EXIT
+def parse(grid):
+    rows = [_row_bytes(row) for row in grid]
+    raw = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), len(rows[0]))
+    return _CODES[raw]
+def _runs(codes):
+    # Горизонтальные отрезки открытых клеток сразу становятся вершинами:
+    # номер отрезка для каждой клетки считается накопленным максимумом по строке
+    n, m = codes.shape
+    open_ = codes != WALL
+    starts = open_.copy()
+    starts[:, 1:] &= ~open_[:, :-1]
+    idx = np.arange(n * m, dtype=np.int32).reshape(n, m)
+    first = np.maximum.accumulate(np.where(starts, idx, 0), axis=1)
+    rank = np.cumsum(starts.ravel(), dtype=np.int32) - 1
+    node = np.where(open_, rank[first.ravel()].reshape(n, m), -1)
+    return node, np.flatnonzero(starts)
+def label(codes):
+    # Связные компоненты (4-связность) без обхода по клеткам: отрезки строк соединяются
+    # вертикальными ребрами, корни подвешиваются к меньшему корню со сжатием указателей
+    # (схема Шилоаха-Вишкина). Метка компоненты - плоский индекс ее первой клетки, у стен -1
+    n, m = codes.shape
+    node, run_start = _runs(codes)
+    if not run_start.size: return np.full(codes.shape, -1, dtype=np.int32)  # одни стены
+    vertical = (node[:-1, :] >= 0) & (node[1:, :] >= 0)
+    u, w = node[:-1, :][vertical], node[1:, :][vertical]
+    parent = np.arange(run_start.size, dtype=np.int32)
+    while u.size:
+        pu, pw = parent[u], parent[w]
+        cross = pu != pw
+        if not cross.any(): break
+        u, w, pu, pw = u[cross], w[cross], pu[cross], pw[cross]
+        parent[np.maximum(pu, pw)] = np.minimum(pu, pw)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent): break
+            parent = jumped
+    first_cell = run_start.astype(np.int32)[parent]
+    return np.where(node >= 0, first_cell[np.maximum(node, 0)], -1)
+class Components:
+    def __init__(self, grid):
+        self.codes = codes = grid if isinstance(grid, np.ndarray) else parse(grid)
+        self.labels = label(codes)
+        flat = self.labels.ravel()
+        self.exit_labels = flat[np.flatnonzero(codes.ravel() == EXIT)]
+        starts = np.flatnonzero(codes.ravel() == START)
+        self.start_label = flat[starts[0]] if starts.size else None
+    def count_exits(self):
+        # Сколько выходов в одной компоненте с S - то же, что dfs из maze.py
+        if self.start_label is None: return 0
+        return int(np.count_nonzero(self.exit_labels == self.start_label))
+    def exitless(self):
+        # Компоненты без выходов, каждая задана своей первой клеткой (i, j)
+        roots = np.unique(self.labels[self.labels >= 0])
+        empty = np.setdiff1d(roots, self.exit_labels, assume_unique=False)
+        m = self.codes.shape[1]
+        return [(int(r) // m, int(r) % m) for r in empty]
+def count_exits(grid):
+    return Components(grid).count_exits()
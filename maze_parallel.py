@@ -0,0 +1,106 @@
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from maze_solver import _row_bytes
+# Разметка огромного лабиринта по плиткам в нескольких процессах. Клетки и метки лежат
+# в общей памяти, процессам передаются только имена блоков и границы плиток.
+# Метка клетки - плоский индекс первой клетки ее компоненты внутри плитки
+_RUN = re.compile(rb'[^0]+')
+def _label_tile(cells_name, labels_name, m, r0, r1, c0, c1):
+    cells_shm = shared_memory.SharedMemory(name=cells_name)
+    labels_shm = shared_memory.SharedMemory(name=labels_name)
+    labels = labels_shm.buf.cast('i')
+    try:
+        rows = [bytes(cells_shm.buf[i * m + c0:i * m + c1]) for i in range(r0, r1)]
+        parent = []
+        runs = []  # по строкам плитки: [(начало, конец, номер отрезка)]
+        prev = []
+        for row in rows:
+            cur = []
+            for r in _RUN.finditer(row):
+                node = len(parent)
+                parent.append(node)
+                cur.append((r.start(), r.end(), node))
+            k = 0
+            for a, b, node in cur:
+                while k < len(prev) and prev[k][1] <= a: k += 1
+                t = k
+                while t < len(prev) and prev[t][0] < b:
+                    x, y = prev[t][2], node
+                    while parent[x] != x: x = parent[x]
+                    while parent[y] != y: y = parent[y]
+                    if x != y: parent[max(x, y)] = min(x, y)
+                    t += 1
+            runs.append(cur)
+            prev = cur
+        # представитель компоненты - ее первая клетка в порядке строк
+        first = {}
+        exits = {}
+        for i, row, cur in zip(range(r0, r1), rows, runs):
+            base = i * m + c0
+            for a, b, node in cur:
+                root = node
+                while parent[root] != root: root = parent[root]
+                parent[node] = root
+                if root not in first: first[root] = base + a
+                label = first[root]
+                labels[base + a:base + b] = array('i', [label]) * (b - a)
+                e = row.count(b'E', a, b)
+                if e: exits[label] = exits.get(label, 0) + e
+        return exits
+    finally:
+        labels.release()
+        cells_shm.close()
+        labels_shm.close()
+def tiles(n, m, tile):
+    return [(r0, min(r0 + tile, n), c0, min(c0 + tile, m))
+            for r0 in range(0, n, tile) for c0 in range(0, m, tile)]
+def count_exits(grid, workers=None, tile=1024):
+    rows = [_row_bytes(row) for row in grid]
+    n, m = len(rows), len(rows[0]) if rows else 0
+    if not n or not m: return 0
+    cells_shm = shared_memory.SharedMemory(create=True, size=n * m)
+    labels_shm = shared_memory.SharedMemory(create=True, size=4 * n * m)
+    labels = labels_shm.buf.cast('i')
+    try:
+        start = -1
+        for i, row in enumerate(rows):
+            cells_shm.buf[i * m:(i + 1) * m] = row
+            if start == -1 and b'S' in row: start = i * m + row.find(b'S')
+        del rows
+        if start == -1: return 0
+        exits = {}
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(_label_tile, cells_shm.name, labels_shm.name, m, *part)
+                       for part in tiles(n, m, tile)]
+            for future in futures:
+                exits.update(future.result())
+        parent = {}
+        def find(x):
+            root = x
+            while parent.get(root, root) != root: root = parent[root]
+            while x != root:
+                parent[x], x = root, parent[x]
+            return root
+        def union(a, b, cells=cells_shm.buf):
+            # буфер - сам cells_shm.buf, его освобождает cells_shm.close() в finally
+            if cells[a] == 48 or cells[b] == 48: return
+            x, y = find(labels[a]), find(labels[b])
+            if x != y: parent[max(x, y)] = min(x, y)
+        # склейка меток через границы плиток
+        for r0 in range(tile, n, tile):
+            for j in range(m):
+                union((r0 - 1) * m + j, r0 * m + j)
+        for c0 in range(tile, m, tile):
+            for i in range(n):
+                union(i * m + c0 - 1, i * m + c0)
+        root = find(labels[start])
+        return sum(e for label, e in exits.items() if find(label) == root)
+    finally:
+        labels.release()
+        cells_shm.close()
+        cells_shm.unlink()
+        labels_shm.close()
+        labels_shm.unlink()
@@ -0,0 +1,81 @@
+from array import array
+from maze_solver import EXIT, _BLOCKED, pad, to_index, find_start
+# Поле расстояний: один BFS сразу от всех источников, дальше запросы без повторного поиска
+class DistanceField:
+    def __init__(self, grid, sources):
+        cells, n, m = pad(grid)
+        self.n, self.m = n, m
+        w = m + 1
+        size = len(cells)
+        self.dist = dist = array('i', [-1]) * size
+        self.parent = parent = array('i', [-1]) * size
+        self.origin = origin = array('i', [-1]) * size
+        self.sources = list(sources)
+        self.exits = []
+        # seen: стены и уже достигнутые клетки, одна проверка на соседа
+        seen = bytearray(cells.translate(_BLOCKED))
+        frontier = []
+        for s, (i, j) in enumerate(self.sources):
+            k = to_index(i, j, m)
+            if seen[k]: continue
+            seen[k] = 1
+            dist[k] = 0
+            origin[k] = s
+            frontier.append(k)
+        exit_count = cells.count(EXIT)
+        d = 1
+        while frontier:
+            if exit_count:
+                for k in frontier:
+                    if cells[k] == EXIT:
+                        self.exits.append((k // w - 1, k % w))
+                        exit_count -= 1
+            nxt = []
+            push = nxt.append
+            for k in frontier:
+                o = origin[k]
+                for nk in (k + w, k - w, k + 1, k - 1):
+                    if not seen[nk]:
+                        seen[nk] = 1
+                        dist[nk] = d
+                        parent[nk] = k
+                        origin[nk] = o
+                        push(nk)
+            frontier = nxt
+            d += 1
+    @classmethod
+    def from_start(cls, grid):
+        # Расстояния от S: exits упорядочены по удаленности, exits[k] - k-й по близости выход
+        start = find_start(grid)
+        return cls(grid, [start] if start is not None else [])
+    @classmethod
+    def from_exits(cls, grid):
+        # Расстояние от любой клетки до ближайшего выхода
+        exits = [(i, j) for i, row in enumerate(grid) for j, v in enumerate(row) if v in ('E', EXIT)]
+        return cls(grid, exits)
+    def _index(self, i, j):
+        if not (0 <= i < self.n and 0 <= j < self.m): return None
+        return to_index(i, j, self.m)
+    def distance(self, i, j):
+        k = self._index(i, j)
+        if k is None or self.dist[k] < 0: return None
+        return self.dist[k]
+    def nearest_source(self, i, j):
+        k = self._index(i, j)
+        if k is None or self.origin[k] < 0: return None
+        return self.sources[self.origin[k]]
+    def path(self, i, j):
+        # Путь от источника до клетки (i, j) по родителям, без нового поиска
+        k = self._index(i, j)
+        if k is None or self.dist[k] < 0: return []
+        w = self.m + 1
+        route = []
+        while k != -1:
+            route.append((k // w - 1, k % w))
+            k = self.parent[k]
+        route.reverse()
+        return route
+    def nearest_exit(self):
+        return self.exits[0] if self.exits else None
+    def path_to_exit(self, k):
+        return self.path(*self.exits[k])
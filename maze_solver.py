@@ -0,0 +1,99 @@
+from array import array
+# Решатель лабиринта без Tk: 0 - стена, 1 - путь, S - вход, E - выход
+WALL, PATH, START, EXIT = ord('0'), ord('1'), ord('S'), ord('E')
+_BLOCKED = bytes(1 if b == WALL else 0 for b in range(256))
+def _row_bytes(row):
+    if isinstance(row, (bytes, bytearray)): return bytes(row)
+    return ''.join(row).encode('ascii')
+def pad(grid):
+    # Плоская раскладка с рамкой из стен: справа у каждой строки стоит стена,
+    # сверху и снизу - строка стен, поэтому соседей k±1, k±w не надо проверять на границы
+    rows = [_row_bytes(row) for row in grid]
+    n, m = len(rows), len(rows[0]) if rows else 0
+    w = m + 1
+    border = b'0' * w
+    cells = border + b''.join(row + b'0' for row in rows) + border
+    return cells, n, m
+def to_index(i, j, m):
+    return (i + 1) * (m + 1) + j
+def to_cell(k, m):
+    i, j = divmod(k, m + 1)
+    return i - 1, j
+def find_start(grid):
+    # У упакованного лабиринта (maze_format.PackedMaze) входы уже лежат в заголовке
+    starts = getattr(grid, 'starts', None)
+    if starts is not None: return tuple(starts[0]) if starts else None
+    for i, row in enumerate(grid):
+        for j, v in enumerate(_row_bytes(row)):
+            if v == START: return i, j
+    return None
+def _walk(cells, m, start):
+    w = m + 1
+    visited = bytearray(cells.translate(_BLOCKED))
+    stack = [to_index(start[0], start[1], m)]
+    while stack:
+        k = stack.pop()
+        if visited[k]: continue
+        visited[k] = 1
+        yield k
+        for nk in (k - 1, k + 1, k - w, k + w):
+            if not visited[nk]: stack.append(nk)
+def walk(grid, start=None):
+    # Итеративный DFS в том же порядке обхода, что и рекурсивный dfs из maze.py:
+    # вниз, вверх, вправо, влево
+    if start is None: start = find_start(grid)
+    if start is None: return
+    cells, n, m = pad(grid)
+    w = m + 1
+    for k in _walk(cells, m, start):
+        yield k // w - 1, k % w
+def record(grid, start=None):
+    # Журнал обхода для проигрывания: по числу на клетку в порядке walk(),
+    # i*m + j для посещенной клетки и -(i*m + j) - 1 для найденного выхода
+    log = array('i')
+    if start is None: start = find_start(grid)
+    if start is None: return log
+    cells, n, m = pad(grid)
+    w = m + 1
+    for k in _walk(cells, m, start):
+        c = k - w - k // w + 1
+        log.append(-c - 1 if cells[k] == EXIT else c)
+    return log
+def solve(grid, start=None):
+    # Возвращает (список достижимых выходов, число посещенных клеток)
+    if start is None: start = find_start(grid)
+    if start is None: return [], 0
+    cells, n, m = pad(grid)
+    w = m + 1
+    # Стены сразу помечены как посещенные - во внутреннем цикле одна проверка
+    visited = bytearray(cells.translate(_BLOCKED))
+    s = to_index(start[0], start[1], m)
+    if visited[s]: return [], 0
+    visited[s] = 1
+    stack = [s]
+    exits = []
+    count = 0
+    pop, push = stack.pop, stack.append
+    while stack:
+        k = pop()
+        count += 1
+        if cells[k] == EXIT: exits.append(to_cell(k, m))
+        nk = k + w
+        if not visited[nk]:
+            visited[nk] = 1
+            push(nk)
+        nk = k - w
+        if not visited[nk]:
+            visited[nk] = 1
+            push(nk)
+        nk = k + 1
+        if not visited[nk]:
+            visited[nk] = 1
+            push(nk)
+        nk = k - 1
+        if not visited[nk]:
+            visited[nk] = 1
+            push(nk)
+    return exits, count
+def count_exits(grid):
+    return len(solve(grid)[0])
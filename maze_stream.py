@@ -0,0 +1,67 @@
+import re
+import sys
+# Потоковый подсчет выходов, достижимых из S: лабиринт читается по одной строке,
+# связность хранится системой непересекающихся множеств только для двух соседних строк,
+# поэтому память растет с шириной лабиринта, а не с площадью
+_RUN = re.compile(rb'[^0\s]+')
+def _row(line):
+    if isinstance(line, str): line = line.encode('ascii')
+    return line.strip()
+def count_exits_stream(lines):
+    prev = []  # отрезки прошлой строки: (начало, конец, номер компоненты)
+    exits = []  # выходов в каждой компоненте прошлой строки
+    start = []  # содержит ли компонента вход S
+    start_seen = False
+    for line in lines:
+        row = _row(line)
+        if not row: continue
+        runs = [(r.start(), r.end()) for r in _RUN.finditer(row)]
+        p = len(exits)
+        parent = list(range(p + len(runs)))
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        node_exits = exits + [row.count(b'E', a, b) for a, b in runs]
+        node_start = start + [False] * len(runs)
+        if not start_seen:
+            s = row.find(b'S')
+            if s != -1:
+                start_seen = True
+                for r, (a, b) in enumerate(runs):
+                    if a <= s < b: node_start[p + r] = True
+        # отрезки соседних строк связаны, если пересекаются по столбцам
+        i = 0
+        for r, (a, b) in enumerate(runs):
+            while i < len(prev) and prev[i][1] <= a: i += 1
+            k = i
+            while k < len(prev) and prev[k][0] < b:
+                x, y = find(prev[k][2]), find(p + r)
+                if x != y:
+                    parent[x] = y
+                    node_exits[y] += node_exits[x]
+                    node_start[y] = node_start[y] or node_start[x]
+                k += 1
+        # компоненты прошлой строки, не дошедшие до текущей, закрыты навсегда
+        alive = {find(p + r) for r in range(len(runs))}
+        for c in range(p):
+            root = find(c)
+            if root not in alive and node_start[root]: return node_exits[root]
+        ids = {}
+        exits, start = [], []
+        new_prev = []
+        for r, (a, b) in enumerate(runs):
+            root = find(p + r)
+            if root not in ids:
+                ids[root] = len(exits)
+                exits.append(node_exits[root])
+                start.append(node_start[root])
+            new_prev.append((a, b, ids[root]))
+        prev = new_prev
+    for c, has_start in enumerate(start):
+        if has_start: return exits[c]
+    return 0
+if __name__ == "__main__":
+    # python maze_stream.py < maze.txt  или  генератор | python maze_stream.py
+    print("Найдено выходов:", count_exits_stream(sys.stdin.buffer))
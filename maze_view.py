@@ -0,0 +1,283 @@
+import math
+import tkinter as tk
+import time
+from maze_solver import _row_bytes
+# Цвета клеток по состоянию
+COLORS = {
+    ('0', False): "black", ('1', False): "white", ('1', True): "orange",
+    ('E', False): "red", ('E', True): "green", ('S', False): "blue", ('S', True): "blue",
+}
+PALETTE = {ord('0'): "black", ord('1'): "white", ord('S'): "blue", ord('E'): "red"}
+# Для блоков клеток при zoom < 1: у клетки один бит, у блока - их объединение,
+# цвет берется по старшему биту, то есть вход важнее выхода, выход - пути, путь - стены
+_RANK = bytes(8 if b == ord('S') else 4 if b == ord('E') else 1 if b == ord('0') else 2 for b in range(256))
+_RANK_COLOR = [None] + [("black", "white", "red", "blue")[r.bit_length() - 1] for r in range(1, 16)]
+def _cell(grid, i, j):
+    # символ клетки для строк str, bytes и PackedMaze (у него cell() не распаковывает строку)
+    value = grid.cell(i, j) if hasattr(grid, "cell") else grid[i][j]
+    return chr(value) if isinstance(value, int) else value
+class CellRenderer:
+    # Один прямоугольник на клетку создается один раз, дальше меняется только fill
+    def __init__(self, canvas, grid, cell=20):
+        self.canvas = canvas
+        self.grid = grid
+        self.cell = cell
+        self.n, self.m = len(grid), len(grid[0])
+        self.ids = []
+        self.colors = {}
+        self.build()
+    def color_of(self, i, j, visited=False):
+        return COLORS.get((_cell(self.grid, i, j), visited), "white")
+    def build(self):
+        c, cell = self.canvas, self.cell
+        c.delete("all")
+        self.ids = []
+        self.colors = {}
+        for i in range(self.n):
+            row_ids = []
+            for j in range(self.m):
+                x1, y1 = j*cell, i*cell
+                row_ids.append(c.create_rectangle(x1, y1, x1+cell, y1+cell,
+                                                  fill=self.color_of(i, j), outline="gray"))
+            self.ids.append(row_ids)
+    def recolor(self, i, j, color):
+        # O(1): одна операция с холстом, и только если цвет действительно изменился
+        if self.colors.get((i, j)) == color: return
+        self.colors[(i, j)] = color
+        self.canvas.itemconfigure(self.ids[i][j], fill=color)
+    def visit(self, i, j):
+        self.recolor(i, j, self.color_of(i, j, True))
+    def reset(self, i, j):
+        self.recolor(i, j, self.color_of(i, j))
+    refresh = reset
+    def cell_at(self, x, y):
+        i, j = int(y // self.cell), int(x // self.cell)
+        if 0 <= i < self.n and 0 <= j < self.m: return i, j
+        return None
+    def highlight(self, cells, color="cyan"):
+        for i, j in cells:
+            self.recolor(i, j, color)
+class TraversalPlayer:
+    # Проигрывает журнал maze_solver.record() через цикл событий Tk: не больше fps кадров
+    # в секунду, за кадр применяются все события, которые положены по времени,
+    # так что медленные кадры пропускаются, а окно не блокируется
+    def __init__(self, root, renderer, log, fps=30, rate=20, on_finish=None):
+        self.root = root
+        self.renderer = renderer
+        self.log = log
+        self.fps = fps
+        self.rate = rate  # событий в секунду при скорости 1
+        self.speed = 1.0
+        self.on_finish = on_finish
+        self.position = 0
+        self.exits = 0
+        self.playing = False
+        self.job = None
+        self.clock = 0.0
+        self.frame_budget = 0.0
+    def cell(self, k):
+        return divmod(k if k >= 0 else -k - 1, self.renderer.m)
+    def play(self):
+        if self.playing or self.position >= len(self.log): return
+        self.playing = True
+        self.clock = time.perf_counter()
+        self.frame_budget = 0.0
+        self.tick()
+    def pause(self):
+        self.playing = False
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+    def toggle(self):
+        if self.playing: self.pause()
+        else: self.play()
+    def set_speed(self, speed):
+        self.speed = max(speed, 0.01)
+    def tick(self):
+        self.job = None
+        if not self.playing: return
+        now = time.perf_counter()
+        self.frame_budget += (now - self.clock) * self.rate * self.speed
+        self.clock = now
+        steps = int(self.frame_budget)
+        self.frame_budget -= steps
+        if steps: self.seek(self.position + steps)
+        if self.position >= len(self.log):
+            self.playing = False
+            if self.on_finish: self.on_finish()
+            return
+        self.job = self.root.after(max(1, int(1000 / self.fps)), self.tick)
+    def seek(self, position):
+        # Перемотка вперед досветит клетки, назад - вернет им исходный цвет
+        position = max(0, min(position, len(self.log)))
+        while self.position < position:
+            k = self.log[self.position]
+            if k < 0: self.exits += 1
+            self.renderer.visit(*self.cell(k))
+            self.position += 1
+        while self.position > position:
+            self.position -= 1
+            k = self.log[self.position]
+            if k < 0: self.exits -= 1
+            self.renderer.reset(*self.cell(k))
+    def skip(self, frames):
+        # Сдвиг на целое число кадров при текущей скорости
+        self.seek(self.position + int(frames * self.rate * self.speed / self.fps) or frames)
+class ViewportRenderer:
+    # Для лабиринтов больше окна: рисуется одна картинка PhotoImage размером с окно.
+    # При zoom >= 1 пиксель берет цвет клетки под собой, перерисовка стоит O(пикселей окна).
+    # При zoom < 1 на пиксель приходится блок клеток, и цвет собирается со всего блока
+    # (см. redraw_blocks): коридор в одну клетку и отметки обхода не пропадают
+    BACKGROUND = "#202020"
+    def __init__(self, canvas, grid, width=800, height=600, zoom=4.0):
+        self.canvas = canvas
+        self.grid = grid
+        self.n, self.m = len(grid), len(grid[0])
+        self.width, self.height = width, height
+        self.zoom = zoom  # пикселей на клетку
+        self.x = self.y = 0.0  # левый верхний угол окна в пикселях всего лабиринта
+        self.marks = {}  # i*m + j -> цвет для клеток, отличающихся от исходного
+        self.image = tk.PhotoImage(width=width, height=height)
+        canvas.configure(width=width, height=height)
+        canvas.create_image(0, 0, image=self.image, anchor="nw")
+        self.pending = None
+        self.drag = None
+        self.moved = False
+        canvas.bind("<ButtonPress-1>", self.on_press)
+        canvas.bind("<B1-Motion>", self.on_drag)
+        canvas.bind("<MouseWheel>", lambda e: self.zoom_at(e.x, e.y, 1.25 if e.delta > 0 else 0.8))
+        canvas.bind("<Button-4>", lambda e: self.zoom_at(e.x, e.y, 1.25))
+        canvas.bind("<Button-5>", lambda e: self.zoom_at(e.x, e.y, 0.8))
+        self.redraw()
+    def color_of(self, i, j, visited=False):
+        return COLORS.get((_cell(self.grid, i, j), visited), "white")
+    def clamp(self):
+        self.x = max(0.0, min(self.x, self.m * self.zoom - self.width))
+        self.y = max(0.0, min(self.y, self.n * self.zoom - self.height))
+    def redraw(self):
+        self.pending = None
+        self.clamp()
+        if self.zoom < 1: return self.redraw_blocks()
+        self.view = (self.x, self.y, self.zoom, None, None)
+        z, m, marks = self.zoom, self.m, self.marks
+        cols = [int((self.x + px) / z) for px in range(self.width)]
+        cols = [j for j in cols if j < m]
+        tail = ' '.join([self.BACKGROUND] * (self.width - len(cols)))
+        blank = '{' + ' '.join([self.BACKGROUND] * self.width) + '}'
+        lines = []
+        line, prev = blank, None
+        for py in range(self.height):
+            i = int((self.y + py) / z)
+            if i != prev:
+                prev = i
+                if i >= self.n: line = blank
+                else:
+                    row, base = _row_bytes(self.grid[i]), i * m
+                    colors = [marks.get(base + j) or PALETTE[row[j]] for j in cols] if marks else \
+                        [PALETTE[row[j]] for j in cols]
+                    line = '{' + ' '.join(colors) + (' ' + tail if tail else '') + '}'
+            lines.append(line)
+        self.image.put(' '.join(lines), to=(0, 0))
+    def blocks(self, count, offset, size):
+        # zoom < 1: для каждого пикселя [первая клетка, конец) его блока или None за краем;
+        # клетка c попадает в пиксель floor(c*zoom - offset), так же ее ищет paint_block
+        z = self.zoom
+        result = [None] * size
+        for c in range(max(0, int(offset / z) - 1), count):
+            p = math.floor(c * z - offset)
+            if p >= size: break
+            if p < 0: continue
+            if result[p] is None: result[p] = [c, c + 1]
+            else: result[p][1] = c + 1
+        return result
+    def redraw_blocks(self):
+        # Строки блока объединяются побитовым ИЛИ целиком (по байту на клетку), столбцы -
+        # max по срезу; отметка обхода или подсветка любой клетки блока закрашивает весь пиксель
+        z, m = self.zoom, self.m
+        rows = self.blocks(self.n, self.y, self.height)
+        cols = self.blocks(m, self.x, self.width)
+        self.view = (self.x, self.y, z, rows, cols)
+        marked = {}
+        for k, color in self.marks.items():
+            i, j = divmod(k, m)
+            py, px = math.floor(i * z - self.y), math.floor(j * z - self.x)
+            if 0 <= py < self.height and 0 <= px < self.width: marked.setdefault(py, {})[px] = color
+        blank = '{' + ' '.join([self.BACKGROUND] * self.width) + '}'
+        lines = []
+        for py, block in enumerate(rows):
+            if block is None:
+                lines.append(blank)
+                continue
+            ranks = 0
+            for i in range(*block):
+                ranks |= int.from_bytes(_row_bytes(self.grid[i]).translate(_RANK), 'big')
+            ranks = ranks.to_bytes(m, 'big')
+            colors = [_RANK_COLOR[max(ranks[c[0]:c[1]])] if c else self.BACKGROUND for c in cols]
+            for px, color in marked.get(py, {}).items():
+                colors[px] = color
+            lines.append('{' + ' '.join(colors) + '}')
+        self.image.put(' '.join(lines), to=(0, 0))
+    def block_color(self, rows, cols):
+        rank = 0
+        for i in range(*rows):
+            base = i * self.m
+            for j in range(*cols):
+                if base + j in self.marks: return self.marks[base + j]
+                rank |= _RANK[ord(_cell(self.grid, i, j))]
+        return _RANK_COLOR[rank]
+    def paint_block(self, i, j):
+        x, y, z, rows, cols = self.view
+        py, px = math.floor(i * z - y), math.floor(j * z - x)
+        if not (0 <= py < len(rows) and 0 <= px < len(cols)) or rows[py] is None or cols[px] is None: return
+        self.image.put(self.block_color(rows[py], cols[px]), to=(px, py, px + 1, py + 1))
+    def schedule(self):
+        # несколько событий мыши между кадрами дают одну перерисовку
+        if self.pending is None: self.pending = self.canvas.after_idle(self.redraw)
+    def span(self, j, offset):
+        z = self.zoom
+        a = max(0, -int(-(j * z - offset) // 1))
+        b = -int(-((j + 1) * z - offset) // 1)
+        return a, b
+    def recolor(self, i, j, color):
+        k = i * self.m + j
+        if self.marks.get(k) == color: return
+        self.marks[k] = color
+        self.paint(i, j, color)
+    def paint(self, i, j, color):
+        if self.view[2] < 1: return self.paint_block(i, j)  # цвет пикселя зависит от всего блока
+        x1, x2 = self.span(j, self.x)
+        y1, y2 = self.span(i, self.y)
+        x2, y2 = min(x2, self.width), min(y2, self.height)
+        if x1 < x2 and y1 < y2: self.image.put(color, to=(x1, y1, x2, y2))
+    def visit(self, i, j):
+        self.recolor(i, j, self.color_of(i, j, True))
+    def reset(self, i, j):
+        if self.marks.pop(i * self.m + j, None) is not None: self.paint(i, j, self.color_of(i, j))
+    def refresh(self, i, j):
+        # клетка изменилась в самой сетке (правка лабиринта)
+        self.marks.pop(i * self.m + j, None)
+        self.paint(i, j, self.color_of(i, j))
+    def cell_at(self, x, y):
+        i, j = int((self.y + y) / self.zoom), int((self.x + x) / self.zoom)
+        if 0 <= i < self.n and 0 <= j < self.m: return i, j
+        return None
+    def highlight(self, cells, color="cyan"):
+        for i, j in cells:
+            self.recolor(i, j, color)
+    def on_press(self, event):
+        self.drag = (event.x, event.y)
+        self.moved = False
+    def on_drag(self, event):
+        if self.drag is None: return
+        self.moved = True
+        self.x -= event.x - self.drag[0]
+        self.y -= event.y - self.drag[1]
+        self.drag = (event.x, event.y)
+        self.schedule()
+    def zoom_at(self, px, py, factor):
+        # масштаб вокруг точки под курсором
+        zoom = min(max(self.zoom * factor, min(self.width / self.m, self.height / self.n, 1.0)), 64.0)
+        self.x = (self.x + px) * zoom / self.zoom - px
+        self.y = (self.y + py) * zoom / self.zoom - py
+        self.zoom = zoom
+        self.schedule()
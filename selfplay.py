@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from bitboard import BitBoard
+from chenakin_lab_navBatte import Board
+from fleet import random_fleet
+from sparseboard import SparseBoard
+from targeting import DensityTargeting, random_target
+# Бот против бота без окна: python selfplay.py --games 1000000 --first density --second random -j 8
+# Партии делятся на пачки, у каждой пачки свое зерно, поэтому итог не зависит от числа процессов
+STRATEGIES = {"random": lambda: random_target, "density": DensityTargeting}
+BOARDS = {"list": Board, "bit": BitBoard, "sparse": SparseBoard}
+def random_board(rng, board_class=Board):
+    board = board_class()
+    for x, y, _, _, size, horizontal in random_fleet(rng=rng):
+        board.place_ship(x, y, size, horizontal)
+    return board
+def finish(strategy, board, rng):
+    # (выстрелы до победы, промахи): промах передает ход, значит ходов было промахи + 1
+    shots = misses = 0
+    while not board.all_ships_sunk():
+        x, y = strategy(board, rng)
+        result, _ = board.shoot(x, y)
+        if result == "repeat": raise RuntimeError(f"стратегия выстрелила повторно в {x}, {y}")
+        shots += 1
+        misses += result == "miss"
+    return shots, misses
+def play(first, second, rng, board_class=Board):
+    # Как в GameApp: первый ходит первым, попадание дает еще выстрел.
+    # Каждый стреляет по своему полю независимо, побеждает тот, кто закончит за меньше ходов
+    a = finish(first, random_board(rng, board_class), rng)
+    b = finish(second, random_board(rng, board_class), rng)
+    return (0 if a[1] <= b[1] else 1), a[0], b[0]
+def play_batch(first, second, games, seed, board="list"):
+    rng = random.Random(seed)
+    strategies = STRATEGIES[first](), STRATEGIES[second]()
+    wins, shots = [0, 0], (Counter(), Counter())
+    for _ in range(games):
+        winner, a, b = play(*strategies, rng, BOARDS[board])
+        wins[winner] += 1
+        shots[0][a] += 1
+        shots[1][b] += 1
+    return wins, shots
+def summary(name, wins, shots):
+    games = sum(shots.values())
+    ordered = sorted(shots.elements())
+    return {"strategy": name, "wins": wins, "mean": round(sum(ordered) / games, 3),
+            "median": ordered[games // 2], "min": ordered[0], "max": ordered[-1],
+            "histogram": {str(k): shots[k] for k in sorted(shots)}}
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Партии бот против бота")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--first", choices=sorted(STRATEGIES), default="density")
+    parser.add_argument("--second", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument("--board", choices=sorted(BOARDS), default="bit",
+                        help="поле; итог партий на всех одинаковый, bit быстрее (board_bench.py)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch", type=int, default=1000, help="партий в одной задаче")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="число процессов")
+    parser.add_argument("--out", help="файл для итогов в JSON")
+    args = parser.parse_args(argv)
+    began = time.perf_counter()
+    wins, shots = [0, 0], (Counter(), Counter())
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(play_batch, args.first, args.second, min(args.batch, args.games - start),
+                               args.seed * 1000003 + start // args.batch, args.board)
+                   for start in range(0, args.games, args.batch)]
+        for future in as_completed(futures):
+            batch_wins, batch_shots = future.result()
+            for side in (0, 1):
+                wins[side] += batch_wins[side]
+                shots[side].update(batch_shots[side])
+    seconds = time.perf_counter() - began
+    report = {"games": args.games, "seed": args.seed, "seconds": round(seconds, 3),
+              "games_per_sec": round(args.games / seconds, 1),
+              "players": [summary(args.first, wins[0], shots[0]), summary(args.second, wins[1], shots[1])]}
+    for player in report["players"]:
+        print(f"{player['strategy']:<8} побед {player['wins']:>8}  выстрелов: среднее {player['mean']:7.2f} "
+              f"медиана {player['median']:3} мин {player['min']:3} макс {player['max']:3}", file=sys.stderr)
+    print(f"{args.games} партий за {seconds:.2f} с, {report['games_per_sec']} партий/с", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import random
+from bitboard import _Grid
+from chenakin_lab_navBatte import BOARD_SIZE, FLEET_SIZES
+# Поле для огромных карт: размер свой у каждого поля, хранятся только корабли и выстрелы
+# (словари по клеткам), поэтому любая операция стоит порядка длины корабля, а не площади
+TRIES = 1000  # проб на один корабль
+RESTARTS = 20  # перезапусков всей расстановки
+class SparseBoard:
+    def __init__(self, size=BOARD_SIZE, fleet=FLEET_SIZES):
+        self.size = size
+        self.fleet = list(fleet)
+        self.clear()
+    def clear(self):
+        self.marks = {}  # (x, y) -> -1, 2 или 3: только клетки, в которые стреляли или ореолы потопленных
+        self.ship_at = {}  # (x, y) -> номер корабля
+        self.ships = {}  # номер -> множество клеток; номера не переиспользуются
+        self.hits_left = {}
+        self.ships_left = 0
+        self.open_hits = set()  # попадания в еще не потопленные корабли
+        self.next_id = 0
+        self.grid = _Grid(self)
+    def neighbors(self, x, y):
+        size = self.size
+        return [(nx, ny) for ny in (y - 1, y, y + 1) for nx in (x - 1, x, x + 1)
+                if (nx != x or ny != y) and 0 <= nx < size and 0 <= ny < size]
+    def cell_value(self, x, y):
+        mark = self.marks.get((x, y))
+        if mark is not None: return mark
+        return 1 if (x, y) in self.ship_at else 0
+    def ship_cells(self, x, y, length, horizontal):
+        if horizontal: cells = [(x + i, y) for i in range(length)]
+        else: cells = [(x, y + i) for i in range(length)]
+        size = self.size
+        if not (0 <= x and 0 <= y and cells[-1][0] < size and cells[-1][1] < size): return None
+        return cells
+    def can_place_ship(self, x, y, length, horizontal):
+        cells = self.ship_cells(x, y, length, horizontal)
+        if cells is None: return False
+        for cell in cells:
+            if cell in self.ship_at or cell in self.marks: return False
+        for cell_x, cell_y in cells:
+            for cell in self.neighbors(cell_x, cell_y):
+                if cell in self.ship_at and cell not in self.marks: return False
+        return True
+    def place_ship(self, x, y, length, horizontal):
+        if not self.can_place_ship(x, y, length, horizontal): return False
+        index = self.next_id
+        self.next_id += 1
+        cells = self.ship_cells(x, y, length, horizontal)
+        for cell in cells:
+            self.ship_at[cell] = index
+        self.ships[index] = set(cells)
+        self.hits_left[index] = length
+        self.ships_left += 1
+        return True
+    def remove_ship_at(self, x, y):
+        index = self.ship_at.get((x, y))
+        if index is None: return 0
+        ship = self.ships.pop(index)
+        if self.hits_left.pop(index): self.ships_left -= 1
+        for cell in ship:
+            del self.ship_at[cell]
+            self.marks.pop(cell, None)
+            self.open_hits.discard(cell)
+        return len(ship)
+    def randomize_fleet(self, rng=random):
+        # На поле стандартного размера - полный перебор из fleet, на больших картах флот
+        # редкий, и случайные пробы с перезапуском всей расстановки находят место сразу
+        self.clear()
+        if self.size == BOARD_SIZE:
+            from fleet import random_fleet
+            for x, y, _, _, ship_size, horizontal in random_fleet(self.fleet, rng):
+                self.place_ship(x, y, ship_size, horizontal)
+            return True
+        for _ in range(RESTARTS):
+            if all(self.place_random(ship_size, rng) for ship_size in sorted(self.fleet, reverse=True)):
+                return True
+            self.clear()
+        raise ValueError("флот не помещается на поле")
+    def place_random(self, length, rng=random):
+        if length > self.size: return False
+        span = self.size - length + 1
+        for _ in range(TRIES):
+            horizontal = length == 1 or rng.random() < 0.5
+            x = rng.randrange(span if horizontal else self.size)
+            y = rng.randrange(self.size if horizontal else span)
+            if self.place_ship(x, y, length, horizontal): return True
+        return False
+    def shoot(self, x, y):
+        if not (0 <= x < self.size and 0 <= y < self.size): raise IndexError(f"клетка {x}, {y} вне поля")
+        cell = (x, y)
+        if cell in self.marks: return "repeat", None
+        index = self.ship_at.get(cell)
+        if index is None:
+            self.marks[cell] = -1
+            return "miss", None
+        self.marks[cell] = 2
+        ship = self.ships[index]
+        self.hits_left[index] -= 1
+        if self.hits_left[index]:
+            self.open_hits.add(cell)
+            return "hit", ship
+        self.ships_left -= 1
+        for ship_cell in ship:
+            self.marks[ship_cell] = 3
+            self.open_hits.discard(ship_cell)
+        for cx, cy in ship:
+            for near in self.neighbors(cx, cy):
+                if near not in self.marks and near not in self.ship_at:
+                    self.marks[near] = -1
+        return "sunk", ship
+    def all_ships_sunk(self):
+        return self.ships_left == 0
+    def random_unshot(self, rng=random):
+        # случайная клетка без выстрела: пробы, пока поле в основном не обстреляно, иначе обход
+        size = self.size
+        for _ in range(64):
+            cell = (rng.randrange(size), rng.randrange(size))
+            if cell not in self.marks: return cell
+        cells = [(x, y) for y in range(size) for x in range(size) if (x, y) not in self.marks]
+        return rng.choice(cells) if cells else None
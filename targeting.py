@@ -0,0 +1,186 @@
+import random
+from chenakin_lab_navBatte import FLEET_SIZES
+# Стратегии выстрела бота: функция или объект (board, rng) -> (x, y).
+# Видно только то, что видно игроку: -1 промах, 2 попадание, 3 потоплен, 0/1 - неизвестно
+def random_target(board, rng=random):
+    # Прежняя логика GameApp.choose_ai_target: добивать вокруг попаданий, иначе наугад
+    if hasattr(board, "open_hits"):
+        return _sparse_random_target(board, rng)
+    if _has_masks(board):
+        return _mask_random_target(board, rng)
+    grid = board.grid
+    size = len(grid)
+    hits = []
+    for y in range(size):
+        for x in range(size):
+            if grid[y][x] == 2:
+                hits.append((x, y))
+    rng.shuffle(hits)
+    for hx, hy in hits:
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = hx + dx, hy + dy
+            if 0 <= nx < size and 0 <= ny < size:
+                if grid[ny][nx] not in (-1, 2, 3):
+                    return nx, ny
+    candidates = []
+    for y in range(size):
+        for x in range(size):
+            if grid[y][x] not in (-1, 2, 3):
+                candidates.append((x, y))
+    return rng.choice(candidates) if candidates else (0, 0)
+def _sparse_random_target(board, rng):
+    # то же для SparseBoard без обхода всей карты: открытые попадания хранит само поле
+    hits = sorted(board.open_hits, key=lambda cell: (cell[1], cell[0]))
+    rng.shuffle(hits)
+    for hx, hy in hits:
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = hx + dx, hy + dy
+            if 0 <= nx < board.size and 0 <= ny < board.size:
+                if board.cell_value(nx, ny) not in (-1, 2, 3):
+                    return nx, ny
+    return board.random_unshot(rng) or (0, 0)
+def _has_masks(board):
+    # BitBoard и BoardState: попадания, промахи и потопленные - битовые маски
+    return isinstance(getattr(board, "misses", None), int)
+def _bits(mask):
+    # номера единичных битов по возрастанию - тот же порядок, что обход grid по строкам
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+def _mask_random_target(board, rng):
+    # то же на масках, без чтения grid; случайные числа тратятся так же, как на Board
+    size = len(board.grid)
+    opened = board.hits | board.misses | board.sunk
+    hits = list(_bits(board.hits))
+    rng.shuffle(hits)
+    for k in hits:
+        hx, hy = k % size, k // size
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = hx + dx, hy + dy
+            if 0 <= nx < size and 0 <= ny < size:
+                if not opened >> (ny * size + nx) & 1:
+                    return nx, ny
+    free = ~opened & ((1 << size * size) - 1)
+    count = bin(free).count("1")
+    if not count: return 0, 0
+    # rng.choice по числу свободных клеток, как по их списку, затем i-я свободная клетка:
+    # сначала строка по числу единиц в ней, потом бит внутри строки
+    i = rng.choice(range(count))
+    full_row = (1 << size) - 1
+    for y in range(size):
+        row = free >> (y * size) & full_row
+        in_row = bin(row).count("1")
+        if i >= in_row:
+            i -= in_row
+            continue
+        for x in _bits(row):
+            if not i: return x, y
+            i -= 1
+_PLACEMENTS = {}
+def placements(size, length):
+    # [(маска корабля, маска соседей без самого корабля, номера клеток)] для поля size x size
+    if (size, length) not in _PLACEMENTS:
+        result = []
+        for horizontal in (True, False) if length > 1 else (True,):
+            for y in range(size if horizontal else size - length + 1):
+                for x in range(size - length + 1 if horizontal else size):
+                    cells = tuple((y + (0 if horizontal else i)) * size + x + (i if horizontal else 0)
+                                  for i in range(length))
+                    ship = sum(1 << k for k in cells)
+                    halo = 0
+                    for k in cells:
+                        cx, cy = k % size, k // size
+                        for ny in range(max(cy - 1, 0), min(cy + 2, size)):
+                            for nx in range(max(cx - 1, 0), min(cx + 2, size)):
+                                halo |= 1 << (ny * size + nx)
+                    result.append((ship, halo & ~ship, cells))
+        _PLACEMENTS[size, length] = result
+    return _PLACEMENTS[size, length]
+def sunk_lengths(grid):
+    # длины потопленных кораблей: связные группы клеток со значением 3
+    size = len(grid)
+    seen = set()
+    lengths = []
+    for y in range(size):
+        for x in range(size):
+            if grid[y][x] != 3 or (x, y) in seen: continue
+            stack, length = [(x, y)], 0
+            seen.add((x, y))
+            while stack:
+                cx, cy = stack.pop()
+                length += 1
+                for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                    if 0 <= nx < size and 0 <= ny < size and (nx, ny) not in seen and grid[ny][nx] == 3:
+                        seen.add((nx, ny))
+                        stack.append((nx, ny))
+            lengths.append(length)
+    return lengths
+def _mask_sunk_lengths(sunk, size):
+    # то же по маске потопленных клеток
+    lengths = []
+    while sunk:
+        stack = [(sunk & -sunk).bit_length() - 1]
+        sunk &= sunk - 1
+        length = 0
+        while stack:
+            k = stack.pop()
+            length += 1
+            x = k % size
+            for nk in (k - 1 if x else -1, k + 1 if x < size - 1 else -1, k - size, k + size):
+                if nk >= 0 and sunk >> nk & 1:
+                    sunk ^= 1 << nk
+                    stack.append(nk)
+        lengths.append(length)
+    return lengths
+class DensityTargeting:
+    # Для каждой клетки считается, сколько расстановок оставшихся кораблей ее накрывают
+    # с учетом промахов, попаданий и ореолов потопленных. Допустимые позиции только
+    # убывают по ходу игры, поэтому их списки хранятся и на каждом ходу лишь фильтруются
+    def __init__(self, fleet=FLEET_SIZES):
+        self.fleet = list(fleet)
+        self.board = None
+        self.legal = {}
+        self.sunk = 0, []  # (маска потопленных, их длины): маска меняется только при потоплении
+    def __call__(self, board, rng=random):
+        grid = board.grid
+        size = len(grid)
+        if board is not self.board:
+            self.board = board
+            self.legal = {length: placements(size, length) for length in set(self.fleet)}
+        if _has_masks(board):
+            empty, hits = board.misses | board.sunk, board.hits
+            if board.sunk != self.sunk[0]: self.sunk = board.sunk, _mask_sunk_lengths(board.sunk, size)
+            sunk = self.sunk[1]
+        else:
+            empty = hits = 0
+            for y in range(size):
+                row = grid[y]
+                for x in range(size):
+                    v = row[x]
+                    if v == -1 or v == 3: empty |= 1 << (y * size + x)
+                    elif v == 2: hits |= 1 << (y * size + x)
+            sunk = sunk_lengths(grid)
+        remaining = list(self.fleet)
+        for length in sunk:
+            if length in remaining: remaining.remove(length)
+        density = [0] * (size * size)
+        for length in set(remaining):
+            # корабль не лежит на промахе или потопленном и не касается чужого попадания
+            legal = [p for p in self.legal[length] if not p[0] & empty and not p[1] & hits]
+            self.legal[length] = legal
+            weight = remaining.count(length)
+            for ship, _, cells in legal:
+                # рядом с попаданием считаем только позиции, которые его накрывают
+                if hits and not ship & hits: continue
+                for k in cells:
+                    density[k] += weight
+        best, choices = 0, []
+        for k, d in enumerate(density):
+            if (empty | hits) >> k & 1 or d < best: continue
+            if d > best: best, choices = d, []
+            choices.append(k)
+        if best == 0:
+            return random_target(board, rng)
+        k = rng.choice(choices)
+        return k % size, k // size